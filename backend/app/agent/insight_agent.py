@@ -11,6 +11,7 @@ import logging
 import re
 import time
 import uuid
+from functools import lru_cache
 from typing import AsyncGenerator, Any
 
 from google import genai
@@ -146,26 +147,30 @@ class InsightAgent:
         r"\bwrite\s+(a|an)\s+(poem|song|story)\b",
     ]
 
+    # Compiled once; the patterns are fused so a message is scanned in one pass
+    _OUT_OF_SCOPE_RE = re.compile("|".join(_OUT_OF_SCOPE_PATTERNS))
+    # Meta phrases and BI keywords as one literal alternation (plain substring
+    # matching, like `in`), replacing a Python-level check per phrase
+    _IN_SCOPE_RE = re.compile("|".join(
+        re.escape(phrase) for phrase in sorted(_ALLOWLIST_META | _IN_SCOPE_HINTS)
+    ))
+
     @classmethod
     def _is_in_scope(cls, message: str) -> bool:
         msg = (message or "").strip().lower()
         if not msg:
             return True
 
-        if any(meta in msg for meta in cls._ALLOWLIST_META):
-            return True
-
-        if any(hint in msg for hint in cls._IN_SCOPE_HINTS):
+        # Only a known out-of-scope pattern can reject a message, so most
+        # messages are decided by this single scan
+        if not cls._OUT_OF_SCOPE_RE.search(msg):
+            # Otherwise, defer to the model + system prompt.
+            # Short messages without keywords are likely follow-ups that rely on
+            # conversation context (e.g., "why?", "break it down further").
             return True
 
-        for pattern in cls._OUT_OF_SCOPE_PATTERNS:
-            if re.search(pattern, msg):
-                return False
-
-        # Otherwise, defer to the model + system prompt.
-        # Short messages without keywords are likely follow-ups that rely on
-        # conversation context (e.g., "why?", "break it down further").
-        return True
+        # Meta questions and BI keywords win over an out-of-scope pattern
+        return cls._IN_SCOPE_RE.search(msg) is not None
 
     def _load_conversation_history(
         self,
@@ -229,8 +234,15 @@ class InsightAgent:
             )
         return self._client
 
-    def _build_tools(self) -> list[types.Tool]:
-        """Build tool declarations for Gemini."""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _build_tools() -> list[types.Tool]:
+        """
+        Build tool declarations for Gemini.
+
+        The declarations are the same for every agent, so they are built once
+        per process and shared (GenerateContentConfig copies the list).
+        """
         function_declarations = []
 
         for tool_def in get_tool_definitions():
@@ -118,6 +118,10 @@ You have saved the following information about this user from previous interacti
 IMPORTANT: When the user asks "what do you remember" or "what do you know about me", tell them about these saved findings directly - you don't need to call any tools. Reference these findings when relevant to their questions.
 """
 
+# Split once at import so build_system_prompt() can splice the summary in
+# without re-parsing the template on every request
+_MEMORY_PREFIX, _MEMORY_SUFFIX = MEMORY_CONTEXT_TEMPLATE.split("{memory_summary}")
+
 
 def build_system_prompt(memory_summary: str | None = None) -> str:
     """
@@ -129,9 +133,8 @@ def build_system_prompt(memory_summary: str | None = None) -> str:
     Returns:
         Complete system prompt string
     """
-    prompt = FULL_SYSTEM_PROMPT
-
-    if memory_summary:
-        prompt += MEMORY_CONTEXT_TEMPLATE.format(memory_summary=memory_summary)
+    if not memory_summary:
+        # Strings are immutable, so the shared constant can be returned as-is
+        return FULL_SYSTEM_PROMPT
 
-    return prompt
+    return f"{FULL_SYSTEM_PROMPT}{_MEMORY_PREFIX}{memory_summary}{_MEMORY_SUFFIX}"
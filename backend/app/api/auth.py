@@ -4,24 +4,130 @@ Authentication utilities for InsightAgent API.
 Separated to avoid circular imports between main.py and routes.py.
 """
 
-from fastapi import Security, HTTPException
-from fastapi.security import APIKeyHeader
+import hmac
+from typing import Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import get_settings
 
 
-# API Key authentication
-API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
+# Settings are fixed for the process lifetime, so resolve them once at import
+_settings = get_settings()
+
+# Skip auth in development if no key is set
+_AUTH_DISABLED = _settings.environment == "development" and not _settings.demo_api_key
+
+# Expected key, encoded once for constant-time comparison
+_EXPECTED_KEY = _settings.demo_api_key.encode() if _settings.demo_api_key else None
+
+# Only API routes require a key (health checks and docs stay public)
+API_PATH_PREFIX = "/api/"
+
+# Cloud Run health checks are answered by the middleware without routing
+HEALTH_PATH = "/health"
+_HEALTH_BODY = b'{"status":"healthy","service":"insightagent"}'
+
+# Pre-built response pieces
+_ALLOW_METHODS = b"GET, POST, DELETE"
+_PREFLIGHT_MAX_AGE = b"600"
+_FORBIDDEN_BODY = b'{"detail":"Invalid or missing API key"}'
+_DISALLOWED_ORIGIN_BODY = b"Disallowed CORS origin"
+
+
+class ApiKeyCorsMiddleware:
+    """
+    Pure ASGI middleware combining CORS handling and API key verification.
+
+    Headers are read straight from the ASGI scope in a single pass, CORS
+    preflights are answered without entering the router, and CORS headers
+    are injected into the response start message. This replaces Starlette's
+    CORSMiddleware plus a per-route FastAPI dependency. Health checks get a
+    pre-serialized response without entering the router.
+    """
+
+    def __init__(self, app: ASGIApp, allow_origins: Iterable[str]) -> None:
+        self.app = app
+        self._allow_origins = frozenset(origin.encode() for origin in allow_origins)
+
+    def _cors_headers(self, origin: bytes) -> list[tuple[bytes, bytes]]:
+        """Headers added to every response for an allowed origin."""
+        return [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+    async def _respond(
+        self,
+        send: Send,
+        status: int,
+        body: bytes,
+        content_type: bytes,
+        headers: list[tuple[bytes, bytes]],
+    ) -> None:
+        """Send a complete response without constructing a Response object."""
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", content_type),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"] == HEALTH_PATH and scope["method"] == "GET":
+            await self._respond(send, 200, _HEALTH_BODY, b"application/json", [])
+            return
+
+        origin = api_key = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"x-api-key":
+                api_key = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        allowed_origin = origin if origin in self._allow_origins else None
+
+        # CORS preflight: answer directly (browsers never send the API key here)
+        if scope["method"] == "OPTIONS" and origin is not None and request_method is not None:
+            if allowed_origin is None:
+                await self._respond(send, 400, _DISALLOWED_ORIGIN_BODY, b"text/plain; charset=utf-8", [])
+                return
+            headers = self._cors_headers(allowed_origin)
+            headers.append((b"access-control-allow-methods", _ALLOW_METHODS))
+            headers.append((b"access-control-max-age", _PREFLIGHT_MAX_AGE))
+            if request_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await self._respond(send, 200, b"OK", b"text/plain; charset=utf-8", headers)
+            return
+
+        cors_headers = self._cors_headers(allowed_origin) if allowed_origin is not None else []
 
+        if not _AUTH_DISABLED and scope["path"].startswith(API_PATH_PREFIX):
+            # compare_digest avoids leaking how much of the key matched via timing
+            if not api_key or _EXPECTED_KEY is None or not hmac.compare_digest(api_key, _EXPECTED_KEY):
+                await self._respond(send, 403, _FORBIDDEN_BODY, b"application/json", cors_headers)
+                return
 
-async def verify_api_key(api_key: str = Security(API_KEY_HEADER)) -> str:
-    """Verify the API key for demo authentication."""
-    settings = get_settings()
+        if not cors_headers:
+            await self.app(scope, receive, send)
+            return
 
-    # Skip auth in development if no key is set
-    if settings.environment == "development" and not settings.demo_api_key:
-        return "dev-mode"
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *cors_headers]
+            await send(message)
 
-    if not api_key or api_key != settings.demo_api_key:
-        raise HTTPException(status_code=403, detail="Invalid or missing API key")
-    return api_key
+        await self.app(scope, receive, send_with_cors)
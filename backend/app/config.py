@@ -9,7 +9,6 @@ from functools import lru_cache
 from typing import Optional
 
 import google.auth
-import vertexai
 from pydantic_settings import BaseSettings
 
 
@@ -82,7 +81,9 @@ def init_vertex_ai() -> tuple[str, str]:
             "or configure gcloud with a default project."
         )
 
-    # Initialize Vertex AI
+    # Initialize Vertex AI (SDK imported here, it is slow to load)
+    import vertexai
+
     vertexai.init(
         project=project_id,
         location=settings.vertex_location,
@@ -92,8 +93,9 @@ def init_vertex_ai() -> tuple[str, str]:
     return project_id, settings.vertex_location
 
 
+@lru_cache(maxsize=1)
 def get_bigquery_dataset() -> str:
-    """Get fully qualified BigQuery dataset ID."""
+    """Get fully qualified BigQuery dataset ID (resolved once per process)."""
     settings = get_settings()
     project_id = settings.gcp_project_id
     if not project_id:
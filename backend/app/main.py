@@ -4,22 +4,39 @@ InsightAgent FastAPI Application Entry Point.
 This is the main entry point for the InsightAgent backend API.
 """
 
+import asyncio
+import atexit
 import logging
+import queue
 import time
 import uuid
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import Message, Receive, Scope, Send
 
 from app.config import get_settings, init_vertex_ai
+from app.api.auth import ApiKeyCorsMiddleware
 from app.api.routes import router as api_router
-
-# Configure logging
+from app.services.bigquery_service import get_bigquery_service
+from app.services.firestore_service import get_firestore_service
+
+# Configure logging. Records are formatted by the QueueHandler and written to
+# stderr by a listener thread, so request handlers and tool calls never block
+# on log I/O
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes queued records on exit
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[QueueHandler(_log_queue)],
 )
 logger = logging.getLogger("insightagent")
 
@@ -57,19 +74,84 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class SSEAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip middleware that never compresses Server-Sent Events streams.
+
+    Compressing SSE would make the compressor buffer events until it has
+    enough data to flush, breaking incremental delivery to the browser.
+    The decision is made on the response content type, so only JSON
+    responses (history, memory) are compressed.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        async def app(scope: Scope, receive: Receive, gzip_send: Send) -> None:
+            is_event_stream = False
+
+            async def route_send(message: Message) -> None:
+                nonlocal is_event_stream
+                if message["type"] == "http.response.start":
+                    content_type = Headers(raw=message["headers"]).get("content-type", "")
+                    is_event_stream = content_type.startswith("text/event-stream")
+                # SSE messages bypass the compressor and go straight to the client
+                await (send if is_event_stream else gzip_send)(message)
+
+            await self.app(scope, receive, route_send)
+
+        responder = GZipResponder(app, self.minimum_size, compresslevel=self.compresslevel)
+        await responder(scope, receive, send)
+
+
+# Local frontend dev servers, allowed in development only
+DEV_CORS_ORIGINS = (
+    "http://localhost:5173",
+    "http://localhost:3000",
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:3000",
+)
+
+
+def get_allowed_origins() -> frozenset[str]:
+    """Build the set of CORS origins for the current environment."""
+    settings = get_settings()
+    if settings.environment == "development":
+        return frozenset((settings.allowed_cors_origin, *DEV_CORS_ORIGINS))
+    return frozenset((settings.allowed_cors_origin,))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown."""
     # Startup
     settings = get_settings()
 
-    # Initialize Vertex AI
+    # Initialize Vertex AI (ADC lookup does blocking I/O, keep it off the loop)
     try:
-        project_id, location = init_vertex_ai()
+        project_id, location = await asyncio.to_thread(init_vertex_ai)
         logger.info(f"Initialized Vertex AI: project={project_id}, location={location}")
     except Exception as e:
         logger.warning(f"Could not initialize Vertex AI: {e}")
 
+    # Build the BigQuery client now so the first query doesn't pay for it
+    bigquery_service = get_bigquery_service()
+    try:
+        await asyncio.to_thread(lambda: bigquery_service.client)
+        logger.info("Initialized BigQuery client")
+    except Exception as e:
+        logger.warning(f"Could not initialize BigQuery client: {e}")
+
+    # Same for Firestore (firebase_admin init + credential load)
+    firestore_service = get_firestore_service()
+    try:
+        await asyncio.to_thread(lambda: firestore_service.db)
+        logger.info("Initialized Firestore client")
+    except Exception as e:
+        logger.warning(f"Could not initialize Firestore client: {e}")
+
     logger.info("InsightAgent API started")
     yield
 
@@ -85,26 +167,11 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Configure CORS
-settings = get_settings()
-allowed_origins = [settings.allowed_cors_origin]
-
-# In development, also allow localhost variations
-if settings.environment == "development":
-    allowed_origins.extend([
-        "http://localhost:5173",
-        "http://localhost:3000",
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:3000",
-    ])
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "DELETE"],
-    allow_headers=["*"],
-)
+# CORS and API key auth are handled together by a single ASGI middleware
+app.add_middleware(ApiKeyCorsMiddleware, allow_origins=get_allowed_origins())
+
+# Compress JSON responses (SSE streams are passed through untouched)
+app.add_middleware(SSEAwareGZipMiddleware, minimum_size=1000)
 
 # Add request logging middleware
 app.add_middleware(RequestLoggingMiddleware)
@@ -115,7 +182,12 @@ app.include_router(api_router, prefix="/api")
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for Cloud Run."""
+    """
+    Health check endpoint for Cloud Run.
+
+    GET requests are answered by ApiKeyCorsMiddleware before routing; the
+    route is kept so the endpoint stays documented in the OpenAPI schema.
+    """
     return {"status": "healthy", "service": "insightagent"}
 
 
@@ -5,15 +5,29 @@ Defines request/response schemas with validation.
 """
 
 import re
-import uuid
 from datetime import datetime
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
 
 
-# Validation pattern for user IDs
-VALID_USER_ID = re.compile(r'^[a-zA-Z0-9_-]{1,64}$')
+# User IDs: alphanumeric, underscore, or hyphen. Checked by pydantic-core
+# itself, so both request models share one validator with no Python callback
+UserId = Annotated[
+    str,
+    StringConstraints(min_length=1, max_length=64, pattern=r'^[a-zA-Z0-9_-]{1,64}$'),
+]
+
+# Validation pattern for session IDs (canonical UUID v4 string)
+VALID_UUID4 = re.compile(
+    r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}\Z',
+    re.IGNORECASE,
+)
+
+# Whitespace normalization: any whitespace run, and whitespace that would be
+# rewritten (non-space characters or runs of two or more)
+_WS_RE = re.compile(r'\s+')
+_EXCESS_WS_RE = re.compile(r'[^\S ]|  ')
 
 
 # =============================================================================
@@ -22,14 +36,7 @@ VALID_USER_ID = re.compile(r'^[a-zA-Z0-9_-]{1,64}$')
 
 class SessionCreate(BaseModel):
     """Request to create a new chat session."""
-    user_id: str = Field(..., min_length=1, max_length=64)
-
-    @field_validator('user_id')
-    @classmethod
-    def validate_user_id(cls, v: str) -> str:
-        if not VALID_USER_ID.match(v):
-            raise ValueError('Invalid user_id format. Use alphanumeric, underscore, or hyphen.')
-        return v
+    user_id: UserId
 
 
 class SessionResponse(BaseModel):
@@ -47,30 +54,23 @@ class SessionResponse(BaseModel):
 class MessageRequest(BaseModel):
     """Request to send a chat message."""
     session_id: str = Field(..., min_length=36, max_length=36)
-    user_id: str = Field(..., min_length=1, max_length=64)
+    user_id: UserId
     content: str = Field(..., min_length=1, max_length=4000)
 
-    @field_validator('user_id')
-    @classmethod
-    def validate_user_id(cls, v: str) -> str:
-        if not VALID_USER_ID.match(v):
-            raise ValueError('Invalid user_id format')
-        return v
-
     @field_validator('session_id')
     @classmethod
     def validate_session_id(cls, v: str) -> str:
-        try:
-            uuid.UUID(v, version=4)
-        except ValueError:
+        if not VALID_UUID4.match(v):
             raise ValueError('Invalid session_id format. Must be UUID v4.')
         return v
 
     @field_validator('content')
     @classmethod
     def sanitize_content(cls, v: str) -> str:
-        # Strip excessive whitespace
-        return ' '.join(v.split())
+        # Strip excessive whitespace (most messages are already clean)
+        if not _EXCESS_WS_RE.search(v) and v[:1] != ' ' and v[-1:] != ' ':
+            return v
+        return _WS_RE.sub(' ', v).strip()
 
 
 class MessageResponse(BaseModel):
@@ -86,8 +86,14 @@ class MessageResponse(BaseModel):
 # SSE Event Models
 # =============================================================================
 
+# Events are immutable once emitted and carry only their declared fields
+_EVENT_CONFIG = ConfigDict(frozen=True, extra='forbid')
+
+
 class ReasoningEvent(BaseModel):
     """Event for tool reasoning trace."""
+    model_config = _EVENT_CONFIG
+
     seq: int
     trace_id: str
     tool_name: str
@@ -98,12 +104,16 @@ class ReasoningEvent(BaseModel):
 
 class ContentEvent(BaseModel):
     """Event for content delta."""
+    model_config = _EVENT_CONFIG
+
     seq: int
     delta: str
 
 
 class MemoryEvent(BaseModel):
     """Event for memory save."""
+    model_config = _EVENT_CONFIG
+
     seq: int
     memory_type: str
     key: str
@@ -112,6 +122,8 @@ class MemoryEvent(BaseModel):
 
 class DoneEvent(BaseModel):
     """Event signaling completion."""
+    model_config = _EVENT_CONFIG
+
     seq: int
     suggested_followups: list[str] = Field(default_factory=list)
 
@@ -5,8 +5,11 @@ Provides secure query execution with SQL injection prevention,
 cost controls, and error handling.
 """
 
+import asyncio
 import logging
 import re
+import sys
+from functools import cached_property
 from typing import Any
 
 from google.cloud import bigquery
@@ -23,9 +26,88 @@ PROHIBITED_KEYWORDS = [
     r'\bGRANT\b', r'\bREVOKE\b', r'\bEXEC\b', r'\bEXECUTE\b',
 ]
 
+# All prohibited keywords as one alternation, so validation is a single pass
+_PROHIBITED_RE = re.compile('|'.join(PROHIBITED_KEYWORDS), re.IGNORECASE)
+
+# Existing LIMIT clause
+_HAS_LIMIT = re.compile(r'\bLIMIT\s+\d+', re.IGNORECASE)
+
 # Maximum query length (characters)
 MAX_QUERY_LENGTH = 10000
 
+# Start of the next comment, quoted identifier or string literal. String
+# literals may carry an r/b prefix (raw, bytes, or both in either order)
+_LEX_START = re.compile(
+    r"--|#|/\*|`"
+    r"|(?:(?<!\w)(?P<prefix>[rR][bB]?|[bB][rR]?))?"
+    r"""(?P<quote>'{3}|"{3}|['"])"""
+)
+
+# Body and closing delimiter of each quoted form. Backslash escapes the next
+# character except in raw strings; only triple-quoted strings span lines
+_QUOTED_BODY = {
+    "'": re.compile(r"(?:[^'\\\n]|\\.)*'", re.DOTALL),
+    '"': re.compile(r'(?:[^"\\\n]|\\.)*"', re.DOTALL),
+    "`": re.compile(r"(?:[^`\\\n]|\\.)*`", re.DOTALL),
+    "'''": re.compile(r"(?:[^\\]|\\.)*?'''", re.DOTALL),
+    '"""': re.compile(r'(?:[^\\]|\\.)*?"""', re.DOTALL),
+}
+_RAW_BODY = {
+    "'": re.compile(r"[^'\n]*'"),
+    '"': re.compile(r'[^"\n]*"'),
+    "'''": re.compile(r"(?s:.)*?'''"),
+    '"""': re.compile(r'(?s:.)*?"""'),
+}
+
+
+def _executable_sql(sql: str) -> str | None:
+    """
+    Strip comments, string literals and quoted identifiers from a query.
+
+    Follows BigQuery's lexical rules: `--`, `#` and `/* */` comments,
+    single-, double- and triple-quoted strings with optional r/b prefixes,
+    and backtick-quoted identifiers. Each stripped token becomes a single
+    space.
+
+    Args:
+        sql: The SQL query to scan
+
+    Returns:
+        The query text that would actually be executed as SQL, or None if a
+        literal or comment is unterminated or could be read more than one way
+    """
+    out = []
+    pos = 0
+    while (match := _LEX_START.search(sql, pos)) is not None:
+        out.append(sql[pos:match.start()])
+        token = match.group(0)
+        if token == "--" or token == "#":
+            end = sql.find("\n", match.end())
+            if end == -1:
+                end = len(sql)
+        elif token == "/*":
+            end = sql.find("*/", match.end())
+            if end == -1:
+                return None
+            end += 2
+        else:
+            quote = match.group("quote") or token
+            raw = "r" in (match.group("prefix") or "").lower()
+            body = (_RAW_BODY if raw else _QUOTED_BODY)[quote].match(sql, match.end())
+            if body is None:
+                return None
+            end = body.end()
+            if raw:
+                # BigQuery rejects raw strings ending in an odd number of
+                # backslashes; refuse them rather than guess where they end
+                content = sql[match.end():end - len(quote)]
+                if (len(content) - len(content.rstrip("\\"))) % 2:
+                    return None
+        out.append(" ")
+        pos = end
+    out.append(sql[pos:])
+    return "".join(out)
+
 
 class BigQueryService:
     """Service for executing BigQuery queries with security constraints."""
@@ -35,6 +117,19 @@ class BigQueryService:
         self.settings = get_settings()
         self._client: bigquery.Client | None = None
 
+        # Job configs never change, so build them once and reuse per query
+        self._dry_run_config = bigquery.QueryJobConfig(
+            dry_run=True,
+            use_query_cache=False,
+        )
+        self._exec_config = bigquery.QueryJobConfig(
+            maximum_bytes_billed=self.settings.max_query_bytes,
+            # Identical queries are answered from BigQuery's result cache
+            # (no bytes billed). This is the default, set explicitly so it
+            # isn't lost if the config grows
+            use_query_cache=True,
+        )
+
     @property
     def client(self) -> bigquery.Client:
         """Lazy initialization of BigQuery client."""
@@ -44,9 +139,9 @@ class BigQueryService:
             self._client = bigquery.Client(project=project)
         return self._client
 
-    @property
+    @cached_property
     def dataset(self) -> str:
-        """Get the fully qualified dataset ID."""
+        """Get the fully qualified dataset ID (resolved on first access)."""
         return get_bigquery_dataset()
 
     def validate_query(self, sql: str) -> tuple[bool, str | None]:
@@ -66,20 +161,24 @@ class BigQueryService:
         if len(sql) > MAX_QUERY_LENGTH:
             return False, f"Query exceeds maximum length of {MAX_QUERY_LENGTH} characters"
 
-        # Check for multiple statements (semicolons not in strings)
-        # Simple check: reject if semicolon found outside of quotes
-        # This is a basic check - dry_run provides server-side validation
-        clean_sql = re.sub(r"'[^']*'", "", sql)  # Remove single-quoted strings
-        clean_sql = re.sub(r'"[^"]*"', "", clean_sql)  # Remove double-quoted strings
-        if ';' in clean_sql:
+        # Both checks below look only at executable SQL, so keywords and
+        # semicolons inside literals, quoted identifiers or comments don't
+        # cause false rejections. Anything the lexer can't read unambiguously
+        # is rejected. This is a basic check - dry_run provides server-side
+        # validation
+        code = _executable_sql(sql)
+        if code is None:
+            return False, "Unterminated or ambiguous string literal or comment"
+
+        # Check for multiple statements
+        if ';' in code:
             return False, "Multiple statements not allowed (semicolon detected)"
 
         # Check for prohibited keywords
-        sql_upper = sql.upper()
-        for pattern in PROHIBITED_KEYWORDS:
-            if re.search(pattern, sql_upper):
-                keyword = pattern.replace(r'\b', '').strip()
-                return False, f"Prohibited keyword detected: {keyword}. Only SELECT queries allowed."
+        match = _PROHIBITED_RE.search(code)
+        if match:
+            keyword = match.group(0).upper()
+            return False, f"Prohibited keyword detected: {keyword}. Only SELECT queries allowed."
 
         return True, None
 
@@ -94,12 +193,13 @@ class BigQueryService:
             SQL with LIMIT clause added if missing
         """
         # Check if LIMIT is already present (case-insensitive)
-        if re.search(r'\bLIMIT\s+\d+', sql, re.IGNORECASE):
+        if _HAS_LIMIT.search(sql):
             return sql
 
-        # Wrap query with LIMIT
+        # Wrap query with LIMIT (newline keeps a trailing -- comment from
+        # swallowing the closing parenthesis)
         max_rows = self.settings.max_result_rows
-        return f"SELECT * FROM ({sql.rstrip().rstrip(';')}) AS limited_query LIMIT {max_rows}"
+        return f"SELECT * FROM ({sql.rstrip().rstrip(';')}\n) AS limited_query LIMIT {max_rows}"
 
     async def dry_run(self, sql: str) -> dict[str, Any]:
         """
@@ -112,14 +212,11 @@ class BigQueryService:
             Dict with validation results and cost estimate
         """
         try:
-            job_config = bigquery.QueryJobConfig(
-                dry_run=True,
-                use_query_cache=False,
+            # Execute dry run (blocking client call, run off the event loop)
+            dry_run_job = await asyncio.to_thread(
+                self.client.query, sql, job_config=self._dry_run_config
             )
 
-            # Execute dry run
-            dry_run_job = self.client.query(sql, job_config=job_config)
-
             # Check statement type (server-side truth)
             statement_type = dry_run_job.statement_type
             if statement_type != "SELECT":
@@ -164,6 +261,38 @@ class BigQueryService:
                 "error": f"Query validation failed: {str(e)}",
             }
 
+    def _run_query(self, sql: str) -> tuple[bigquery.QueryJob, list[str], list[tuple], int]:
+        """
+        Run a query and fetch its result rows (blocking).
+
+        Args:
+            sql: The SQL query to run
+
+        Returns:
+            Tuple of (query_job, column names, rows as tuples, total rows in
+            the result, which may exceed the rows fetched)
+        """
+        query_job = self.client.query(sql, job_config=self._exec_config)
+
+        # Wait for results with timeout. max_results also caps queries that
+        # carry their own (larger) LIMIT, so no more rows are downloaded than
+        # we would keep
+        result = query_job.result(
+            timeout=self.settings.query_timeout_seconds,
+            max_results=self.settings.max_result_rows,
+        )
+
+        # Keep results columnar (column names + one tuple per row); dicts
+        # are only built at the edge for the rows that get displayed
+        rows = [tuple(row) for row in result]
+        # Interned so recurring queries reuse the same key strings for the
+        # row dicts built at display time
+        columns = [sys.intern(field.name) for field in result.schema]
+        # The row iterator knows the full result size before any rows are
+        # fetched, so the true total is reported even when capped
+        total_rows = result.total_rows if result.total_rows is not None else len(rows)
+        return query_job, columns, rows, total_rows
+
     async def execute_query(self, sql: str) -> dict[str, Any]:
         """
         Execute a validated SQL query.
@@ -172,7 +301,9 @@ class BigQueryService:
             sql: The SQL query to execute
 
         Returns:
-            Dict with success status, data, columns, row_count, or error
+            Dict with success status, columns, rows (tuples in column order,
+            at most max_result_rows), row_count (total rows in the result),
+            or error
         """
         # Step 1: Basic validation
         is_valid, error = self.validate_query(sql)
@@ -180,7 +311,7 @@ class BigQueryService:
             return {
                 "success": False,
                 "error": error,
-                "data": [],
+                "rows": [],
                 "columns": [],
                 "row_count": 0,
                 "bytes_processed": 0,
@@ -192,7 +323,7 @@ class BigQueryService:
             return {
                 "success": False,
                 "error": dry_run_result["error"],
-                "data": [],
+                "rows": [],
                 "columns": [],
                 "row_count": 0,
                 "bytes_processed": dry_run_result["bytes_processed"],
@@ -203,25 +334,18 @@ class BigQueryService:
 
         # Step 4: Execute with timeout and cost limits
         try:
-            job_config = bigquery.QueryJobConfig(
-                maximum_bytes_billed=self.settings.max_query_bytes,
+            # Submitting, waiting and paging through rows all block on the
+            # network, so the whole fetch runs in a worker thread
+            query_job, columns, rows, total_rows = await asyncio.to_thread(
+                self._run_query, safe_sql
             )
 
-            query_job = self.client.query(safe_sql, job_config=job_config)
-
-            # Wait for results with timeout
-            result = query_job.result(timeout=self.settings.query_timeout_seconds)
-
-            # Convert to list of dicts
-            rows = [dict(row) for row in result]
-            columns = [field.name for field in result.schema]
-
             # Get actual bytes processed/billed
             bytes_processed = query_job.total_bytes_processed or 0
             bytes_billed = query_job.total_bytes_billed or 0
 
             logger.info(
-                f"Query executed: {len(rows)} rows, "
+                f"Query executed: {total_rows} rows ({len(rows)} fetched), "
                 f"{bytes_processed:,} bytes processed, "
                 f"{bytes_billed:,} bytes billed"
             )
@@ -229,9 +353,9 @@ class BigQueryService:
             return {
                 "success": True,
                 "error": None,
-                "data": rows,
+                "rows": rows,
                 "columns": columns,
-                "row_count": len(rows),
+                "row_count": total_rows,
                 "bytes_processed": bytes_processed,
                 "bytes_billed": bytes_billed,
             }
@@ -240,7 +364,7 @@ class BigQueryService:
             return {
                 "success": False,
                 "error": f"Query timed out after {self.settings.query_timeout_seconds} seconds",
-                "data": [],
+                "rows": [],
                 "columns": [],
                 "row_count": 0,
                 "bytes_processed": 0,
@@ -249,7 +373,7 @@ class BigQueryService:
             return {
                 "success": False,
                 "error": f"Access denied: {str(e)}",
-                "data": [],
+                "rows": [],
                 "columns": [],
                 "row_count": 0,
                 "bytes_processed": 0,
@@ -258,7 +382,7 @@ class BigQueryService:
             return {
                 "success": False,
                 "error": f"Table or dataset not found: {str(e)}",
-                "data": [],
+                "rows": [],
                 "columns": [],
                 "row_count": 0,
                 "bytes_processed": 0,
@@ -268,7 +392,7 @@ class BigQueryService:
             return {
                 "success": False,
                 "error": f"Query execution failed: {str(e)}",
-                "data": [],
+                "rows": [],
                 "columns": [],
                 "row_count": 0,
                 "bytes_processed": 0,
@@ -5,13 +5,20 @@ Provides user memory CRUD operations, session management,
 and cross-session memory retrieval.
 """
 
+import asyncio
+import copy
 import logging
 import re
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
+from functools import cached_property
+from itertools import islice
 from typing import Any
 
 import firebase_admin
 from firebase_admin import firestore
+from google.api_core.exceptions import NotFound
 from google.cloud.firestore_v1.base_query import FieldFilter
 
 from app.config import get_settings
@@ -20,6 +27,30 @@ logger = logging.getLogger(__name__)
 
 # Validation pattern for user IDs
 VALID_USER_ID = re.compile(r'^[a-zA-Z0-9_-]{1,64}$')
+INVALID_USER_ID_ERROR = "Invalid user_id format"
+
+# Characters not allowed in memory keys (keys become Firestore field paths)
+_UNSAFE_KEY_CHAR = re.compile(r'[^a-zA-Z0-9_]')
+
+# Sessions expire after 24 hours (enforced by a Firestore TTL policy on expire_at)
+SESSION_TTL = timedelta(hours=24)
+
+# User document field path for each memory type ("{}" is the memory key)
+_MEMORY_FIELD = {
+    "finding": "findings.{}",
+    "preference": "preferences.{}",
+    "context": "summary",  # Context updates the summary field
+}
+
+# Session fields read by get_past_analyses
+PAST_ANALYSIS_FIELDS = ("session_id", "created_at", "topics", "findings")
+
+# User memory cache for the agent's context lookups: entries are served as-is
+# while fresh, served and refreshed in the background once older than
+# USER_MEMORY_REFRESH_AFTER, and refetched once older than USER_MEMORY_CACHE_TTL
+USER_MEMORY_CACHE_TTL = 60.0  # seconds
+USER_MEMORY_REFRESH_AFTER = 15.0  # seconds
+USER_MEMORY_CACHE_MAX_ENTRIES = 256
 
 # Memory compaction limits
 MAX_FINDINGS_IN_SUMMARY = 5
@@ -28,13 +59,26 @@ MAX_SUMMARY_TOKENS = 500  # Approximate limit
 
 
 class FirestoreService:
-    """Service for Firestore operations including memory and sessions."""
+    """
+    Service for Firestore operations including memory and sessions.
+
+    The firebase_admin client is synchronous, so every Firestore call is run
+    in a worker thread via asyncio.to_thread to keep the event loop free.
+    """
 
     def __init__(self):
         """Initialize the Firestore service."""
         self.settings = get_settings()
         self._db = None
         self._collection_prefix = self.settings.firestore_collection_prefix
+        self._users_collection_name = f"{self._collection_prefix}_users"
+
+        # LRU of user_id -> (fetched_at, memory); see USER_MEMORY_CACHE_TTL
+        self._memory_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        # Bumped on every invalidation so in-flight refreshes don't store
+        # data read before a write
+        self._memory_cache_version = 0
+        self._memory_refresh_tasks: dict[str, asyncio.Task] = {}
 
     @property
     def db(self):
@@ -46,18 +90,36 @@ class FirestoreService:
             self._db = firestore.client()
         return self._db
 
-    def _validate_user_id(self, user_id: str) -> None:
-        """Validate user ID format to prevent path traversal."""
-        if not VALID_USER_ID.match(user_id):
-            raise ValueError(f"Invalid user_id format: {user_id}")
-
-    def _users_collection(self) -> str:
-        """Get the users collection name."""
-        return f"{self._collection_prefix}_users"
-
-    def _sessions_collection(self, user_id: str) -> str:
-        """Get the sessions subcollection path."""
-        return f"{self._users_collection()}/{user_id}/sessions"
+    def _is_valid_user_id(self, user_id: str) -> bool:
+        """Check user ID format to prevent path traversal."""
+        if VALID_USER_ID.match(user_id):
+            return True
+        logger.warning("Rejected invalid user_id format")
+        return False
+
+    @cached_property
+    def _users_ref(self):
+        """Users collection reference (built once, on first use)."""
+        return self.db.collection(self._users_collection_name)
+
+    def _user_ref(self, user_id: str):
+        """Get the user's memory document reference."""
+        return self._users_ref.document(user_id)
+
+    def _sessions_ref(self, user_id: str):
+        """Get the user's sessions subcollection reference."""
+        return self._users_ref.document(user_id).collection("sessions")
+
+    def _session_ref(self, user_id: str, session_id: str):
+        """Get a session document reference."""
+        return self._sessions_ref(user_id).document(session_id)
+
+    @staticmethod
+    def _add_doc(collection_ref, data: dict[str, Any]):
+        """Add a document with an auto-generated ID and return its reference (blocking)."""
+        # google-cloud-firestore 2.x returns (update_time, document_ref)
+        _, doc_ref = collection_ref.add(data)
+        return doc_ref
 
     async def get_user_memory(self, user_id: str) -> dict[str, Any]:
         """
@@ -69,11 +131,17 @@ class FirestoreService:
         Returns:
             Dict with summary, preferences, findings
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return {
+                "summary": None,
+                "preferences": {},
+                "findings": {},
+                "last_updated": None,
+            }
 
         try:
-            doc_ref = self.db.collection(self._users_collection()).document(user_id)
-            doc = doc_ref.get()
+            doc_ref = self._user_ref(user_id)
+            doc = await asyncio.to_thread(doc_ref.get)
 
             if doc.exists:
                 data = doc.to_dict()
@@ -100,6 +168,51 @@ class FirestoreService:
                 "last_updated": None,
             }
 
+    async def get_cached_user_memory(self, user_id: str) -> dict[str, Any]:
+        """
+        Get user memory, served from the in-process cache when possible.
+
+        Stale entries are returned immediately and refreshed in the
+        background; writes through this service invalidate the cache.
+
+        Args:
+            user_id: The user's ID
+
+        Returns:
+            Dict with summary, preferences, findings (same as get_user_memory);
+            always a copy, so callers may modify it freely
+        """
+        entry = self._memory_cache.get(user_id)
+        if entry is not None:
+            fetched_at, memory = entry
+            age = time.monotonic() - fetched_at
+            if age < USER_MEMORY_CACHE_TTL:
+                self._memory_cache.move_to_end(user_id)
+                if age > USER_MEMORY_REFRESH_AFTER and user_id not in self._memory_refresh_tasks:
+                    task = asyncio.create_task(self._refresh_user_memory(user_id))
+                    self._memory_refresh_tasks[user_id] = task
+                    task.add_done_callback(lambda _: self._memory_refresh_tasks.pop(user_id, None))
+                return copy.deepcopy(memory)
+            del self._memory_cache[user_id]
+
+        return await self._refresh_user_memory(user_id)
+
+    async def _refresh_user_memory(self, user_id: str) -> dict[str, Any]:
+        """Fetch user memory and cache a copy, evicting the least recently used entry if full."""
+        version = self._memory_cache_version
+        memory = await self.get_user_memory(user_id)
+        if version == self._memory_cache_version:
+            self._memory_cache[user_id] = (time.monotonic(), copy.deepcopy(memory))
+            self._memory_cache.move_to_end(user_id)
+            if len(self._memory_cache) > USER_MEMORY_CACHE_MAX_ENTRIES:
+                self._memory_cache.popitem(last=False)
+        return memory
+
+    def _invalidate_user_memory(self, user_id: str) -> None:
+        """Drop a user's cached memory after a write."""
+        self._memory_cache_version += 1
+        self._memory_cache.pop(user_id, None)
+
     async def get_user_memory_summary(self, user_id: str) -> str | None:
         """
         Get the condensed memory summary for system prompt injection.
@@ -116,43 +229,50 @@ class FirestoreService:
         Returns:
             Memory summary string or None
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return None
 
         try:
-            memory = await self.get_user_memory(user_id)
-
-            if not memory["summary"] and not memory["preferences"] and not memory["findings"]:
+            # Read the user document directly rather than via get_user_memory,
+            # which would repackage it into an intermediate dict
+            doc = await asyncio.to_thread(self._user_ref(user_id).get)
+            if not doc.exists:
                 return None
 
+            data = doc.to_dict()
             parts = []
 
+            # Rough token budget (~4 chars per token). Each stored value is
+            # clipped to the budget before formatting, so an oversized value
+            # can't blow up the intermediate strings; the final truncation
+            # below gives the same result as clipping afterwards would
+            max_chars = MAX_SUMMARY_TOKENS * 4
+
             # Add stored summary if exists
-            if memory.get("summary"):
-                parts.append(memory["summary"])
+            stored_summary = data.get("summary")
+            if stored_summary:
+                parts.append(stored_summary[:max_chars])
 
             # Add recent preferences
-            if memory.get("preferences"):
-                prefs = memory["preferences"]
-                pref_items = list(prefs.items())[:MAX_PREFERENCES_IN_SUMMARY]
-                if pref_items:
-                    pref_str = ", ".join([f"{k}: {v}" for k, v in pref_items])
-                    parts.append(f"User preferences: {pref_str}")
+            prefs = data.get("preferences")
+            if prefs:
+                pref_items = islice(prefs.items(), MAX_PREFERENCES_IN_SUMMARY)
+                pref_str = ", ".join(f"{k}: {str(v)[:max_chars]}" for k, v in pref_items)
+                parts.append(f"User preferences: {pref_str}")
 
             # Add recent findings
-            if memory.get("findings"):
-                findings = memory["findings"]
-                finding_items = list(findings.items())[:MAX_FINDINGS_IN_SUMMARY]
-                if finding_items:
-                    findings_str = "; ".join([f"{k}: {v}" for k, v in finding_items])
-                    parts.append(f"Previous findings: {findings_str}")
+            findings = data.get("findings")
+            if findings:
+                finding_items = islice(findings.items(), MAX_FINDINGS_IN_SUMMARY)
+                findings_str = "; ".join(f"{k}: {str(v)[:max_chars]}" for k, v in finding_items)
+                parts.append(f"Previous findings: {findings_str}")
 
             if not parts:
                 return None
 
             summary = "\n".join(parts)
 
-            # Truncate if too long (rough approximation of tokens)
-            max_chars = MAX_SUMMARY_TOKENS * 4  # ~4 chars per token
+            # Truncate if too long
             if len(summary) > max_chars:
                 summary = summary[:max_chars] + "..."
 
@@ -168,6 +288,7 @@ class FirestoreService:
         memory_type: str,
         key: str,
         value: str,
+        session_id: str | None = None,
     ) -> dict[str, Any]:
         """
         Save a memory item for a user.
@@ -177,11 +298,14 @@ class FirestoreService:
             memory_type: Type of memory (finding, preference, context)
             key: Memory key
             value: Memory value
+            session_id: Current session ID (optional). Findings are also
+                added to this session's context in the same batched write.
 
         Returns:
             Dict with success status
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return {"success": False, "error": INVALID_USER_ID_ERROR}
 
         if not key or not key.strip():
             return {"success": False, "error": "Memory key cannot be empty"}
@@ -189,48 +313,52 @@ class FirestoreService:
         if not value or not value.strip():
             return {"success": False, "error": "Memory value cannot be empty"}
 
-        # Sanitize key (alphanumeric and underscores only)
-        safe_key = re.sub(r'[^a-zA-Z0-9_]', '_', key.strip())[:64]
+        # Sanitize key (alphanumeric and underscores only); most keys are
+        # already clean and are used as-is
+        safe_key = key.strip()[:64]
+        if _UNSAFE_KEY_CHAR.search(safe_key):
+            safe_key = _UNSAFE_KEY_CHAR.sub('_', safe_key)
+
+        # Determine which field to update based on memory_type
+        field_format = _MEMORY_FIELD.get(memory_type)
+        if field_format is None:
+            return {"success": False, "error": f"Invalid memory_type: {memory_type}"}
+        field_path = field_format.format(safe_key)
 
         try:
-            doc_ref = self.db.collection(self._users_collection()).document(user_id)
+            doc_ref = self._user_ref(user_id)
             now = datetime.now(timezone.utc).isoformat()
 
-            # Determine which field to update based on memory_type
-            if memory_type == "finding":
-                field_path = f"findings.{safe_key}"
-            elif memory_type == "preference":
-                field_path = f"preferences.{safe_key}"
-            elif memory_type == "context":
-                # Context updates the summary field
-                field_path = "summary"
+            # A single merge write creates the document if needed and only
+            # touches the given fields, atomically, so there is no need for a
+            # read-then-write transaction
+            if '.' in field_path:
+                # e.g., "findings.q4_revenue" -> {"findings": {"q4_revenue": value}}
+                parent, child = field_path.split('.', 1)
+                data = {parent: {child: value}, "last_updated": now}
             else:
-                return {"success": False, "error": f"Invalid memory_type: {memory_type}"}
-
-            # Use transaction for atomic update of nested field
-            # This ensures either both last_updated and value are set, or neither
-            @firestore.transactional
-            def update_in_transaction(transaction, doc_ref, field_path, value, now):
-                doc = doc_ref.get(transaction=transaction)
-                if doc.exists:
-                    # Document exists - update only the specific nested field
-                    transaction.update(doc_ref, {
-                        field_path: value,
-                        "last_updated": now,
-                    })
-                else:
-                    # Document doesn't exist - create with nested structure
-                    if '.' in field_path:
-                        # e.g., "findings.q4_revenue" -> {"findings": {"q4_revenue": value}}
-                        parts = field_path.split('.')
-                        data = {parts[0]: {parts[1]: value}, "last_updated": now}
-                    else:
-                        data = {field_path: value, "last_updated": now}
-                    transaction.set(doc_ref, data)
-
-            # Run transaction (Firestore client is sync, but we're in async context)
-            transaction = self.db.transaction()
-            update_in_transaction(transaction, doc_ref, field_path, value, now)
+                data = {field_path: value, "last_updated": now}
+
+            saved = False
+            if session_id and memory_type == "finding":
+                # Memory and session context in one commit (one round trip).
+                # The session write is an update, so it never creates a
+                # session doc (one without expire_at would escape the TTL)
+                batch = self.db.batch()
+                batch.set(doc_ref, data, merge=True)
+                batch.update(
+                    self._session_ref(user_id, session_id),
+                    {"findings": firestore.ArrayUnion([f"{key}: {value}"]), "last_updated": now},
+                )
+                try:
+                    await asyncio.to_thread(batch.commit)
+                    saved = True
+                except NotFound:
+                    # Session is gone; the memory itself is still saved below
+                    logger.warning(f"Session {session_id[:8]}... not found, saving memory only")
+            if not saved:
+                await asyncio.to_thread(doc_ref.set, data, merge=True)
+            self._invalidate_user_memory(user_id)
 
             logger.info(f"Saved memory for user {user_id[:4]}***: {memory_type}/{safe_key}")
 
@@ -261,34 +389,35 @@ class FirestoreService:
         Returns:
             Dict with session details and injected memory
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return {
+                "session_id": session_id,
+                "user_id": user_id,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "injected_memory_snapshot": None,
+                "error": INVALID_USER_ID_ERROR,
+            }
 
         try:
-            now = datetime.now(timezone.utc)
+            session_ref = self._session_ref(user_id, session_id)
 
-            # Get memory summary for injection
-            memory_summary = await self.get_user_memory_summary(user_id)
-
-            # Calculate session expiry (24 hours)
-            expire_at = now + timedelta(hours=24)
+            now = datetime.now(timezone.utc)
 
             # Create session document
             session_data = {
                 "user_id": user_id,
                 "session_id": session_id,
                 "created_at": now.isoformat(),
-                "expire_at": expire_at.isoformat(),
-                "injected_memory_snapshot": memory_summary,
+                # Stored as a Timestamp so a Firestore TTL policy can expire it
+                "expire_at": now + SESSION_TTL,
                 "topics": [],
                 "metrics_queried": [],
                 "findings": [],
             }
+            session_data["injected_memory_snapshot"] = await self.get_user_memory_summary(user_id)
 
             # Save to Firestore
-            session_ref = self.db.collection(
-                self._sessions_collection(user_id)
-            ).document(session_id)
-            session_ref.set(session_data)
+            await asyncio.to_thread(session_ref.set, session_data)
 
             logger.info(f"Created session {session_id[:8]}... for user {user_id[:4]}***")
 
@@ -323,12 +452,11 @@ class FirestoreService:
             metric: Metric queried (optional)
             finding: Finding made (optional)
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return
 
         try:
-            session_ref = self.db.collection(
-                self._sessions_collection(user_id)
-            ).document(session_id)
+            session_ref = self._session_ref(user_id, session_id)
 
             updates = {"last_updated": datetime.now(timezone.utc).isoformat()}
 
@@ -339,7 +467,7 @@ class FirestoreService:
             if finding:
                 updates["findings"] = firestore.ArrayUnion([finding])
 
-            session_ref.update(updates)
+            await asyncio.to_thread(session_ref.update, updates)
 
         except Exception as e:
             logger.error(f"Error updating session context: {e}")
@@ -359,13 +487,17 @@ class FirestoreService:
         Returns:
             Dict with session context
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return {
+                "topics": [],
+                "metrics_queried": [],
+                "findings": [],
+                "last_updated": None,
+            }
 
         try:
-            session_ref = self.db.collection(
-                self._sessions_collection(user_id)
-            ).document(session_id)
-            doc = session_ref.get()
+            session_ref = self._session_ref(user_id, session_id)
+            doc = await asyncio.to_thread(session_ref.get)
 
             if doc.exists:
                 data = doc.to_dict()
@@ -392,9 +524,13 @@ class FirestoreService:
                 "last_updated": None,
             }
 
-    async def get_past_analyses(self, user_id: str, limit: int = 5) -> list[dict]:
+    async def get_past_analyses(
+        self,
+        user_id: str,
+        limit: int = 5,
+    ) -> list[dict]:
         """
-        Get summaries of past analysis sessions.
+        Get summaries of past analysis sessions, newest first.
 
         Args:
             user_id: The user's ID
@@ -403,27 +539,30 @@ class FirestoreService:
         Returns:
             List of session summaries
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return []
 
         try:
-            sessions_ref = self.db.collection(self._sessions_collection(user_id))
-            query = sessions_ref.order_by(
-                "created_at", direction=firestore.Query.DESCENDING
-            ).limit(limit)
+            # Project only the listed fields; session docs also carry the
+            # injected memory snapshot, which isn't needed here
+            query = (
+                self._sessions_ref(user_id)
+                .select(PAST_ANALYSIS_FIELDS)
+                .order_by("created_at", direction=firestore.Query.DESCENDING)
+                .limit(limit)
+            )
 
-            docs = query.stream()
+            docs = await asyncio.to_thread(lambda: list(query.stream()))
 
-            sessions = []
-            for doc in docs:
-                data = doc.to_dict()
-                sessions.append({
+            return [
+                {
                     "session_id": data.get("session_id"),
                     "date": data.get("created_at"),
                     "topics": data.get("topics", []),
                     "findings": data.get("findings", []),
-                })
-
-            return sessions
+                }
+                for data in (doc.to_dict() for doc in docs)
+            ]
 
         except Exception as e:
             logger.error(f"Error getting past analyses: {e}")
@@ -439,11 +578,38 @@ class FirestoreService:
         Returns:
             Dict with user preferences
         """
-        self._validate_user_id(user_id)
-
+        # get_user_memory validates user_id and returns empty memory if invalid
         memory = await self.get_user_memory(user_id)
         return memory.get("preferences", {})
 
+    def _delete_user_data(self, user_id: str) -> int:
+        """
+        Delete a user's memory document and all sessions (blocking).
+
+        Session subcollections (messages, usage) are deleted too, since
+        Firestore does not cascade deletes. BulkWriter batches and
+        parallelizes the deletes and stays within per-batch write limits.
+
+        Returns:
+            Number of sessions deleted
+        """
+        bulk_writer = self.db.bulk_writer()
+        bulk_writer.delete(self._user_ref(user_id))
+
+        # list_documents returns references only (no document bodies), and
+        # also covers sessions whose document is gone but subcollections remain
+        count = 0
+        for session_ref in self._sessions_ref(user_id).list_documents():
+            for subcollection in ("messages", "usage"):
+                for ref in session_ref.collection(subcollection).list_documents():
+                    bulk_writer.delete(ref)
+            bulk_writer.delete(session_ref)
+            count += 1
+
+        # Flushes all pending deletes
+        bulk_writer.close()
+        return count
+
     async def reset_user_memory(self, user_id: str) -> dict[str, Any]:
         """
         Reset all memory for a user (demo feature).
@@ -454,25 +620,15 @@ class FirestoreService:
         Returns:
             Dict with success status
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return {"success": False, "error": INVALID_USER_ID_ERROR}
 
         try:
-            # Delete user document
-            user_ref = self.db.collection(self._users_collection()).document(user_id)
-            user_ref.delete()
-
-            # Delete all sessions (batch delete)
-            sessions_ref = self.db.collection(self._sessions_collection(user_id))
-            docs = sessions_ref.stream()
-
-            batch = self.db.batch()
-            count = 0
-            for doc in docs:
-                batch.delete(doc.reference)
-                count += 1
-
-            if count > 0:
-                batch.commit()
+            try:
+                count = await asyncio.to_thread(self._delete_user_data, user_id)
+            finally:
+                # Even a partial delete may have removed the memory document
+                self._invalidate_user_memory(user_id)
 
             logger.info(f"Reset memory for user {user_id[:4]}***: deleted {count} sessions")
 
@@ -510,48 +666,39 @@ class FirestoreService:
         Returns:
             Dict with message details
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return {"error": INVALID_USER_ID_ERROR}
 
         try:
-            now = datetime.now(timezone.utc)
+            now = datetime.now(timezone.utc).isoformat()
             message_data = {
                 "role": role,
                 "content": content,
-                "timestamp": now.isoformat(),
+                "timestamp": now,
             }
             if reasoning_trace:
                 message_data["reasoning_trace"] = reasoning_trace
             if metadata:
                 message_data["metadata"] = metadata
 
-            # Add to messages subcollection within the session
-            messages_ref = self.db.collection(
-                f"{self._sessions_collection(user_id)}/{session_id}/messages"
-            )
-            add_result = messages_ref.add(message_data)
-            # google-cloud-firestore has returned both (update_time, doc_ref) and
-            # (doc_ref, update_time) across versions. Extract the DocumentReference
-            # defensively to avoid runtime failures.
-            doc_ref = None
-            if isinstance(add_result, tuple) and len(add_result) == 2:
-                first, second = add_result
-                if hasattr(first, "id"):
-                    doc_ref = first
-                elif hasattr(second, "id"):
-                    doc_ref = second
-            elif hasattr(add_result, "id"):
-                doc_ref = add_result
-
-            # Update session last_updated
-            session_ref = self.db.collection(self._sessions_collection(user_id)).document(session_id)
-            session_ref.update({"last_updated": now.isoformat()})
+            # Add to messages subcollection and bump the session's last_updated
+            # in one batched commit (one round trip, applied atomically). The
+            # session write is an update, so a missing or expired session
+            # fails the batch rather than leaving a stub session doc behind
+            # that has no expire_at for the TTL policy
+            session_ref = self._session_ref(user_id, session_id)
+            doc_ref = session_ref.collection("messages").document()
+            batch = self.db.batch()
+            batch.set(doc_ref, message_data)
+            batch.update(session_ref, {"last_updated": now})
+            await asyncio.to_thread(batch.commit)
 
             logger.debug(f"Added {role} message to session {session_id[:8]}...")
 
             return {
-                "message_id": getattr(doc_ref, "id", None),
+                "message_id": doc_ref.id,
                 "role": role,
-                "timestamp": now.isoformat(),
+                "timestamp": now,
             }
 
         except Exception as e:
@@ -573,34 +720,23 @@ class FirestoreService:
         This writes to a `usage` subcollection under the session so it can be
         aggregated later (e.g., daily totals, per-user costs, error rates).
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return {"error": INVALID_USER_ID_ERROR}
 
         try:
-            now = datetime.now(timezone.utc)
+            now = datetime.now(timezone.utc).isoformat()
             usage_data = {
-                "timestamp": now.isoformat(),
+                "timestamp": now,
                 "usage": usage,
                 "user_message_id": user_message_id,
                 "assistant_message_id": assistant_message_id,
             }
 
-            usage_ref = self.db.collection(
-                f"{self._sessions_collection(user_id)}/{session_id}/usage"
-            )
-            add_result = usage_ref.add(usage_data)
-
-            doc_ref = None
-            if isinstance(add_result, tuple) and len(add_result) == 2:
-                first, second = add_result
-                if hasattr(first, "id"):
-                    doc_ref = first
-                elif hasattr(second, "id"):
-                    doc_ref = second
-            elif hasattr(add_result, "id"):
-                doc_ref = add_result
+            usage_ref = self._session_ref(user_id, session_id).collection("usage")
+            doc_ref = await asyncio.to_thread(self._add_doc, usage_ref, usage_data)
 
             logger.debug(f"Recorded Gemini usage for session {session_id[:8]}...")
-            return {"usage_id": getattr(doc_ref, "id", None), "timestamp": now.isoformat()}
+            return {"usage_id": doc_ref.id, "timestamp": now}
 
         except Exception as e:
             logger.error(f"Error recording Gemini usage: {e}")
@@ -624,48 +760,44 @@ class FirestoreService:
         Returns:
             Dict with session metadata and messages
         """
-        self._validate_user_id(user_id)
+        if not self._is_valid_user_id(user_id):
+            return {"error": INVALID_USER_ID_ERROR}
 
         try:
-            # Get session document
-            session_ref = self.db.collection(
-                self._sessions_collection(user_id)
-            ).document(session_id)
-            session_doc = session_ref.get()
-
-            if not session_doc.exists:
-                return {"error": "Session not found"}
-
-            session_data = session_doc.to_dict()
-
-            # Get messages from subcollection
-            messages_ref = self.db.collection(
-                f"{self._sessions_collection(user_id)}/{session_id}/messages"
-            )
+            session_ref = self._session_ref(user_id, session_id)
+            messages_ref = session_ref.collection("messages")
 
             if limit:
                 # Get most recent N messages: order DESC, limit, then reverse
                 query = messages_ref.order_by(
                     "timestamp", direction=firestore.Query.DESCENDING
                 ).limit(limit)
-                message_docs = list(query.stream())
-                message_docs.reverse()  # Restore chronological order
             else:
                 # Get all messages in chronological order
                 query = messages_ref.order_by("timestamp")
-                message_docs = query.stream()
 
+            # Session document and messages are independent reads, fetch both at once
+            session_doc, message_docs = await asyncio.gather(
+                asyncio.to_thread(session_ref.get),
+                asyncio.to_thread(lambda: list(query.stream())),
+            )
+
+            if not session_doc.exists:
+                return {"error": "Session not found"}
+
+            session_data = session_doc.to_dict()
+
+            if limit:
+                message_docs.reverse()  # Restore chronological order
+
+            # Stored messages already have the response shape (optional
+            # reasoning_trace/metadata are simply absent), so reuse each dict
+            # and add the document ID instead of copying field by field
             messages = []
             for doc in message_docs:
                 msg_data = doc.to_dict()
-                messages.append({
-                    "message_id": getattr(doc, "id", None),
-                    "role": msg_data.get("role"),
-                    "content": msg_data.get("content"),
-                    "timestamp": msg_data.get("timestamp"),
-                    "reasoning_trace": msg_data.get("reasoning_trace"),
-                    "metadata": msg_data.get("metadata"),
-                })
+                msg_data["message_id"] = doc.id
+                messages.append(msg_data)
 
             return {
                 "session_id": session_id,
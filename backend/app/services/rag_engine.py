@@ -6,16 +6,22 @@ Implements retrieval as a custom tool (not ADK's built-in RAG tool
 due to single-tool-per-agent limitation).
 """
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
-from vertexai import rag
-import vertexai
-
 from app.config import get_settings, init_vertex_ai
 
 logger = logging.getLogger(__name__)
 
+# Knowledge base answers change only when the corpus is re-indexed, and the
+# same questions recur across sessions, so results are cached briefly
+RAG_CACHE_TTL_SECONDS = 300
+RAG_CACHE_MAX_ENTRIES = 256
+
 
 class RAGEngineService:
     """Service for knowledge base retrieval using Vertex AI RAG Engine."""
@@ -25,11 +31,19 @@ class RAGEngineService:
         self.settings = get_settings()
         self._corpus_name = self.settings.rag_corpus_name
         self._initialized = False
+        self._rag: Any = None
+        # (normalized query, top_k, threshold) -> (expires_at, result)
+        self._cache: OrderedDict[tuple, tuple[float, dict[str, Any]]] = OrderedDict()
 
     def _ensure_initialized(self) -> None:
-        """Ensure Vertex AI is initialized."""
+        """Ensure Vertex AI is initialized and the RAG SDK is loaded."""
         if not self._initialized:
+            # Imported on first search so processes that never query the
+            # knowledge base don't load the Vertex SDK
+            from vertexai import rag
+
             init_vertex_ai()
+            self._rag = rag
             self._initialized = True
 
     @property
@@ -82,24 +96,22 @@ class RAGEngineService:
         # Higher relevance threshold means lower distance threshold (stricter filtering)
         distance_threshold = 1.0 - relevance_threshold
 
+        cache_key = (" ".join(query.lower().split()), top_k, relevance_threshold)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            self._ensure_initialized()
-
-            # Perform RAG retrieval query
-            response = rag.retrieval_query(
-                rag_resources=[
-                    rag.RagResource(rag_corpus=self.corpus_name)
-                ],
-                text=query,
-                rag_retrieval_config=rag.RagRetrievalConfig(
-                    top_k=top_k,
-                    filter=rag.Filter(
-                        vector_distance_threshold=distance_threshold
-                    )
-                ),
+            # Initialization and retrieval are blocking gRPC/ADC calls, so they
+            # run in a worker thread and concurrent searches overlap
+            response = await asyncio.to_thread(
+                self._retrieve, query, top_k, distance_threshold
             )
 
-            return self._format_results(response, query)
+            result = self._format_results(response, query)
+            if result["success"]:
+                self._cache_put(cache_key, result)
+            return result
 
         except Exception as e:
             logger.error(f"RAG search failed: {e}")
@@ -110,6 +122,73 @@ class RAGEngineService:
                 "query": query,
             }
 
+    def _retrieve(self, query: str, top_k: int, distance_threshold: float) -> Any:
+        """
+        Run the RAG retrieval query (blocking).
+
+        Args:
+            query: The semantic search query
+            top_k: Number of results to return
+            distance_threshold: Maximum vector distance for a result
+
+        Returns:
+            Raw RAG Engine response
+        """
+        self._ensure_initialized()
+        rag = self._rag
+
+        return rag.retrieval_query(
+            rag_resources=[
+                rag.RagResource(rag_corpus=self.corpus_name)
+            ],
+            text=query,
+            rag_retrieval_config=rag.RagRetrievalConfig(
+                top_k=top_k,
+                filter=rag.Filter(
+                    vector_distance_threshold=distance_threshold
+                )
+            ),
+        )
+
+    def _cache_get(self, key: tuple) -> dict[str, Any] | None:
+        """
+        Look up a cached search result.
+
+        Args:
+            key: Cache key built from the normalized query and search options
+
+        Returns:
+            A copy of the cached result, or None if missing or expired
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        # Callers sanitize results in place, so never hand out the cached dicts
+        return {**result, "results": [dict(r) for r in result["results"]]}
+
+    def _cache_put(self, key: tuple, result: dict[str, Any]) -> None:
+        """
+        Store a search result, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key built from the normalized query and search options
+            result: Formatted search result
+        """
+        self._cache[key] = (
+            time.monotonic() + RAG_CACHE_TTL_SECONDS,
+            {**result, "results": [dict(r) for r in result["results"]]},
+        )
+        self._cache.move_to_end(key)
+        if len(self._cache) > RAG_CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
     def _format_results(self, response: Any, query: str) -> dict[str, Any]:
         """
         Format RAG Engine response into standard format.
@@ -121,34 +200,23 @@ class RAGEngineService:
         Returns:
             Formatted results dict
         """
-        results = []
-
         try:
             # Extract contexts from response
-            if hasattr(response, 'contexts') and response.contexts:
-                for context in response.contexts.contexts:
-                    # Extract source file name from URI
-                    source_uri = getattr(context, 'source_uri', '') or ''
-                    source_name = source_uri.split('/')[-1] if source_uri else 'unknown'
-
-                    # Get the text content
-                    content = getattr(context, 'text', '') or ''
-
-                    # Get relevance score
-                    # Note: Vertex AI RAG API returns 'score' (similarity, higher = more relevant)
-                    # not 'distance'. Score is typically 0-1 range.
-                    score = getattr(context, 'score', None)
-                    if score is not None:
-                        relevance_score = float(score)
-                    else:
-                        relevance_score = 0.5  # Default when score not provided
-
-                    results.append({
-                        "content": content,
-                        "source": source_name,
-                        "relevance_score": round(relevance_score, 3),
-                        "source_uri": source_uri,
-                    })
+            contexts = response.contexts.contexts if getattr(response, 'contexts', None) else ()
+
+            # Note: Vertex AI RAG API returns 'score' (similarity, higher = more relevant)
+            # not 'distance'. Score is typically 0-1 range; 0.5 when not provided.
+            results = []
+            for context in contexts:
+                source_uri = getattr(context, 'source_uri', '') or ''
+                score = getattr(context, 'score', None)
+                results.append({
+                    "content": getattr(context, 'text', '') or '',
+                    # Source file name is the last URI segment
+                    "source": source_uri.rsplit('/', 1)[-1] if source_uri else 'unknown',
+                    "relevance_score": round(float(score), 3) if score is not None else 0.5,
+                    "source_uri": source_uri,
+                })
 
             logger.info(f"RAG search returned {len(results)} results for query: {query[:50]}...")
 
@@ -169,13 +237,7 @@ class RAGEngineService:
             }
 
 
-# Singleton instance
-_rag_service: RAGEngineService | None = None
-
-
+@lru_cache(maxsize=1)
 def get_rag_service() -> RAGEngineService:
     """Get the RAG Engine service singleton."""
-    global _rag_service
-    if _rag_service is None:
-        _rag_service = RAGEngineService()
-    return _rag_service
+    return RAGEngineService()
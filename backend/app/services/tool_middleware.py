@@ -6,11 +6,14 @@ Sanitizes tool outputs before sending to UI:
 - Truncates long outputs
 - Adds source citations
 - Logs tool calls with PII redaction
+- Coalesces identical concurrent tool calls
 """
 
+import asyncio
 import logging
 import re
-from typing import Any
+from itertools import islice
+from typing import Any, Awaitable, Callable, Hashable, Iterable
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +24,30 @@ PII_PATTERNS = [
     (r'\b\d{3}-\d{2}-\d{4}\b', '[SSN]'),
     (r'\b\d{16}\b', '[CARD]'),
     (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '[CARD]'),
-    (r'(?i)(api[_-]?key|apikey|secret|password|token)["\s:=]+["\']?[\w-]+["\']?', '[REDACTED_SECRET]'),
+    (r'(?i:api[_-]?key|apikey|secret|password|token)["\s:=]+["\']?[\w-]+["\']?', '[REDACTED_SECRET]'),
 ]
 
+# All patterns fused into one alternation (one named group per pattern) so
+# text is scanned once; the matching group selects the replacement
+_PII_RE = re.compile('|'.join(
+    f'(?P<pii{i}>{pattern})' for i, (pattern, _) in enumerate(PII_PATTERNS)
+))
+# Every PII pattern needs an '@', a digit or a secret keyword, so text with
+# none of them (most values) skips the full scan
+_PII_TRIGGER = re.compile(r'[@\d]|(?i:key|secret|password|token)')
+
+_PII_REPLACEMENTS = {f'pii{i}': replacement for i, (_, replacement) in enumerate(PII_PATTERNS)}
+
+
+def _pii_replacement(match: re.Match) -> str:
+    """Replacement text for whichever PII pattern matched."""
+    return _PII_REPLACEMENTS[match.lastgroup]
+
+
 # Maximum lengths for truncation
 MAX_SQL_RESULT_ROWS = 50  # Rows to show in UI (full data still available)
 MAX_KB_CONTENT_LENGTH = 2000  # Characters per KB chunk
+KB_WORD_BOUNDARY_WINDOW = 64  # How far back to look for a space when truncating
 MAX_LOG_LENGTH = 500  # Characters in log messages
 
 
@@ -40,13 +61,39 @@ def redact_pii(text: str) -> str:
     Returns:
         Text with PII patterns replaced
     """
-    if not text:
+    if not text or not _PII_TRIGGER.search(text):
         return text
 
-    result = text
-    for pattern, replacement in PII_PATTERNS:
-        result = re.sub(pattern, replacement, result)
-    return result
+    return _PII_RE.sub(_pii_replacement, text)
+
+
+# Joins string cells so a whole result set is redacted in one regex pass. No
+# PII pattern can match NUL (it is neither a word nor a whitespace character),
+# so matches never span two cells and boundaries behave as at string ends
+_CELL_SEP = "\x00"
+
+
+def _redact_cells(values: list[str]) -> list[str]:
+    """
+    Redact PII from many strings with a single scan.
+
+    Args:
+        values: Strings to redact
+
+    Returns:
+        Redacted strings, in the same order
+    """
+    if not values:
+        return values
+
+    # Values carrying the separator themselves can't be split back reliably
+    if any(_CELL_SEP in value for value in values):
+        return [redact_pii(value) for value in values]
+
+    joined = _CELL_SEP.join(values)
+    if not _PII_TRIGGER.search(joined):
+        return values
+    return _PII_RE.sub(_pii_replacement, joined).split(_CELL_SEP)
 
 
 def truncate_for_log(text: str, max_length: int = MAX_LOG_LENGTH) -> str:
@@ -70,36 +117,49 @@ def truncate_for_log(text: str, max_length: int = MAX_LOG_LENGTH) -> str:
 
 
 def sanitize_sql_results(
-    results: list[dict],
+    results: Iterable[tuple],
     columns: list[str],
     max_rows: int = MAX_SQL_RESULT_ROWS,
+    total_rows: int | None = None,
 ) -> dict[str, Any]:
     """
     Sanitize SQL query results for UI display.
 
     Args:
-        results: List of result rows
+        results: Result rows as tuples in column order (a list, or any
+            iterable such as a row iterator)
         columns: Column names
         max_rows: Maximum rows to include in display
+        total_rows: Total rows in the query result, when results holds only
+            part of it (defaults to the number of rows in results)
 
     Returns:
-        Sanitized results with truncation info
+        Sanitized results (rows as dicts keyed by column) with truncation info
     """
-    total_rows = len(results)
-    truncated = total_rows > max_rows
-
-    display_results = results[:max_rows] if truncated else results
-
-    # Redact any PII in string values
-    sanitized_results = []
-    for row in display_results:
-        sanitized_row = {}
-        for key, value in row.items():
-            if isinstance(value, str):
-                sanitized_row[key] = redact_pii(value)
-            else:
-                sanitized_row[key] = value
-        sanitized_results.append(sanitized_row)
+    if isinstance(results, list):
+        row_count = len(results)
+        display_results = results[:max_rows] if row_count > max_rows else results
+    else:
+        # Only the displayed rows are materialized; the rest are just counted
+        rows = iter(results)
+        display_results = list(islice(rows, max_rows))
+        row_count = len(display_results) + sum(1 for _ in rows)
+    if total_rows is None:
+        total_rows = row_count
+    truncated = total_rows > len(display_results)
+
+    # Build dicts only for displayed rows, then redact all string values in
+    # one pass and write them back
+    sanitized_results = [dict(zip(columns, row)) for row in display_results]
+    cells = [
+        (row, key)
+        for row in sanitized_results
+        for key, value in row.items()
+        if isinstance(value, str)
+    ]
+    redacted = _redact_cells([row[key] for row, key in cells])
+    for (row, key), value in zip(cells, redacted):
+        row[key] = value
 
     return {
         "data": sanitized_results,
@@ -121,11 +181,14 @@ def sanitize_kb_content(content: str, source: str) -> dict[str, Any]:
     Returns:
         Sanitized content with citation
     """
-    # Truncate if too long
+    # Truncate if too long, at the last space if one is close to the limit
     if len(content) > MAX_KB_CONTENT_LENGTH:
-        content = content[:MAX_KB_CONTENT_LENGTH] + "..."
+        cut = content.rfind(
+            " ", MAX_KB_CONTENT_LENGTH - KB_WORD_BOUNDARY_WINDOW, MAX_KB_CONTENT_LENGTH
+        )
+        content = content[:cut if cut > 0 else MAX_KB_CONTENT_LENGTH] + "..."
 
-    # Redact any embedded secrets
+    # Redact any embedded secrets (only the retained text is scanned)
     content = redact_pii(content)
 
     return {
@@ -150,6 +213,10 @@ def log_tool_call(
         user_id: User ID (will be partially redacted)
         session_id: Session ID
     """
+    # Redaction and formatting are wasted work if INFO records are dropped
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
     # Redact user ID partially
     safe_user_id = user_id[:4] + "***" if len(user_id) > 4 else "***"
 
@@ -162,8 +229,8 @@ def log_tool_call(
             safe_params[key] = value
 
     logger.info(
-        f"Tool call: {tool_name} | user: {safe_user_id} | "
-        f"session: {session_id[:8]}... | params: {safe_params}"
+        "Tool call: %s | user: %s | session: %.8s... | params: %s",
+        tool_name, safe_user_id, session_id, safe_params,
     )
 
 
@@ -182,24 +249,73 @@ def sanitize_tool_output(
         Sanitized output safe for UI
     """
     # Apply tool-specific sanitization
-    if tool_name == "query_bigquery" and output.get("success"):
-        if "data" in output and "columns" in output:
-            sanitized = sanitize_sql_results(
-                output["data"],
-                output["columns"],
+    if tool_name == "query_bigquery":
+        rows = output.get("rows")
+        columns = output.get("columns")
+        if output.get("success") and rows is not None and columns is not None:
+            # Replace the columnar rows with display-ready dicts
+            del output["rows"]
+            output.update(
+                sanitize_sql_results(rows, columns, total_rows=output.get("row_count"))
             )
-            output.update(sanitized)
 
-    elif tool_name == "search_knowledge_base" and output.get("success"):
-        if "results" in output:
-            sanitized_results = []
-            for result in output["results"]:
+    elif tool_name == "search_knowledge_base":
+        results = output.get("results")
+        if output.get("success") and results is not None:
+            # Sanitized entries replace the raw ones in the same list
+            for i, result in enumerate(results):
                 sanitized = sanitize_kb_content(
                     result.get("content", ""),
                     result.get("source", "unknown"),
                 )
                 sanitized["relevance_score"] = result.get("relevance_score", 0)
-                sanitized_results.append(sanitized)
-            output["results"] = sanitized_results
+                results[i] = sanitized
 
     return output
+
+
+# Futures for tool calls currently running, by call key
+_inflight: dict[Hashable, asyncio.Future] = {}
+
+
+async def singleflight(
+    key: Hashable,
+    call: Callable[[], Awaitable[dict[str, Any]]],
+) -> dict[str, Any]:
+    """
+    Run a tool backend call once for all concurrent callers with the same key.
+
+    The first caller runs call(); callers arriving while it is in flight wait
+    for its result instead of issuing their own request. If the running call
+    is cancelled, a waiting caller takes over and runs it.
+
+    Args:
+        key: Identifies equivalent calls (e.g. tool name plus arguments)
+        call: Zero-argument coroutine function producing the sanitized output
+
+    Returns:
+        The tool output (waiters get a shallow copy of the shared dict)
+    """
+    while (future := _inflight.get(key)) is not None:
+        try:
+            return dict(await asyncio.shield(future))
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # This caller was cancelled, not the running call
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await call()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved in case nobody was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        del _inflight[key]
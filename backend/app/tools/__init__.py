@@ -1,5 +1,7 @@
 # Tools module - ADK tool implementations
 
+from functools import lru_cache
+
 from app.tools.bigquery_tool import (
     get_bigquery_tool_definition,
     query_bigquery,
@@ -18,18 +20,29 @@ from app.tools.memory_tool import (
 )
 
 
-def get_tool_definitions() -> list[dict]:
+@lru_cache(maxsize=1)
+def get_tool_definitions() -> tuple[dict, ...]:
     """
     Get all tool definitions for registering with the agent.
 
     Returns resolved definitions at runtime to avoid import-time ADC lookups.
+    Resolved once per process; a tuple so the shared result can't be mutated.
     """
-    return [
+    return (
         get_bigquery_tool_definition(),
         KNOWLEDGE_TOOL_DEFINITION,
         CONTEXT_TOOL_DEFINITION,
         MEMORY_TOOL_DEFINITION,
-    ]
+    )
+
+
+def __getattr__(name: str):
+    """Resolve runtime-dependent tool definitions on first access (PEP 562)."""
+    if name == "BIGQUERY_TOOL_DEFINITION":
+        return get_bigquery_tool_definition()
+    if name == "TOOL_DEFINITIONS":
+        return get_tool_definitions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
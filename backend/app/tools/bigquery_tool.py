@@ -5,11 +5,30 @@ Executes SQL queries against the company's BigQuery data warehouse
 with security constraints and cost controls.
 """
 
+import re
+import time
+from collections import OrderedDict
 from functools import lru_cache
 from typing import Any
 
 from app.services.bigquery_service import get_bigquery_service
-from app.services.tool_middleware import log_tool_call, sanitize_tool_output
+from app.services.tool_middleware import log_tool_call, sanitize_tool_output, singleflight
+
+
+# Results of repeated queries are reused for a short time: only SELECTs are
+# allowed, so a cached result is what re-running the query would return
+# unless the data changed in between
+QUERY_CACHE_TTL_SECONDS = 60
+QUERY_CACHE_MAX_ENTRIES = 128
+
+# Queries whose result depends on when or by whom they run are never cached
+_VOLATILE_SQL = re.compile(
+    r'\b(?:CURRENT_(?:DATE|DATETIME|TIME|TIMESTAMP)|NOW|RAND|GENERATE_UUID|SESSION_USER)\b',
+    re.IGNORECASE,
+)
+
+# sql -> (expires_at, sanitized result)
+_query_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
 
 
 # Tool description template - dataset placeholder resolved at runtime
@@ -87,8 +106,16 @@ def get_bigquery_tool_definition() -> dict:
     }
 
 
-# Note: BIGQUERY_TOOL_DEFINITION removed to avoid incomplete dict-like wrapper.
-# Use get_bigquery_tool_definition() instead for runtime resolution.
+def __getattr__(name: str) -> Any:
+    """
+    Resolve BIGQUERY_TOOL_DEFINITION on first access (PEP 562).
+
+    The attribute is the plain cached dict from get_bigquery_tool_definition(),
+    so the dataset lookup still happens at runtime rather than at import.
+    """
+    if name == "BIGQUERY_TOOL_DEFINITION":
+        return get_bigquery_tool_definition()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 async def query_bigquery(
@@ -116,9 +143,32 @@ async def query_bigquery(
             session_id=session_id,
         )
 
-    # Get BigQuery service and execute
-    service = get_bigquery_service()
-    result = await service.execute_query(sql)
-
-    # Sanitize output before returning
-    return sanitize_tool_output("query_bigquery", result)
+    # Exact text match: normalizing case or whitespace could change the
+    # meaning of string literals
+    cache_key = sql.strip()
+    entry = _query_cache.get(cache_key)
+    if entry is not None:
+        expires_at, cached = entry
+        if expires_at >= time.monotonic():
+            _query_cache.move_to_end(cache_key)
+            return dict(cached)
+        del _query_cache[cache_key]
+
+    async def run() -> dict[str, Any]:
+        # Get BigQuery service and execute
+        service = get_bigquery_service()
+        result = await service.execute_query(sql)
+
+        # Sanitize output before returning (and before caching, so hits are
+        # returned without sanitizing again)
+        result = sanitize_tool_output("query_bigquery", result)
+
+        if result.get("success") and not _VOLATILE_SQL.search(sql):
+            _query_cache[cache_key] = (time.monotonic() + QUERY_CACHE_TTL_SECONDS, dict(result))
+            if len(_query_cache) > QUERY_CACHE_MAX_ENTRIES:
+                _query_cache.popitem(last=False)
+
+        return result
+
+    # Identical queries already running share that job
+    return await singleflight(("query_bigquery", cache_key), run)
@@ -5,6 +5,8 @@ Retrieves context from current session, user preferences,
 or past analyses to provide personalized responses.
 """
 
+import asyncio
+from datetime import datetime, timezone
 from typing import Any, Literal
 
 from app.services.firestore_service import get_firestore_service
@@ -25,6 +27,7 @@ CONTEXT TYPES:
 1. "current_session": Topics discussed, metrics queried, findings made
 2. "user_preferences": User's preferred formats, regions of interest, role, style
 3. "past_analyses": Summaries of previous sessions with dates and topics
+4. "all": All of the above in one call (fetched concurrently)
 
 WHEN TO USE:
 - When the user says "as we discussed" or refers to earlier conversation
@@ -39,7 +42,7 @@ Returns context with last_updated timestamp.
         "properties": {
             "context_type": {
                 "type": "string",
-                "enum": ["current_session", "user_preferences", "past_analyses"],
+                "enum": ["current_session", "user_preferences", "past_analyses", "all"],
                 "description": "The type of context to retrieve"
             }
         },
@@ -48,8 +51,52 @@ Returns context with last_updated timestamp.
 }
 
 
+def _as_datetime(value: Any) -> datetime | None:
+    """Normalize a stored timestamp (datetime or ISO string) to an aware datetime."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    # Timestamps are written in UTC; treat naive values the same way
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def _current_session(service: Any, user_id: str, session_id: str) -> tuple[dict, Any]:
+    """Get current session context as (data, last_updated)."""
+    context_data = await service.get_session_context(user_id, session_id)
+    return context_data, context_data.get("last_updated")
+
+
+async def _user_preferences(service: Any, user_id: str) -> tuple[dict, Any]:
+    """Get user preferences and findings from memory as (data, last_updated)."""
+    # Read every turn but rarely changed, so served from the service's cache
+    memory = await service.get_cached_user_memory(user_id)
+    preferences = memory.get("preferences", {})
+    data = {
+        "preferences": preferences,
+        "regions_of_interest": preferences.get("regions_of_interest", []),
+        "role": preferences.get("role"),
+        "preferred_format": preferences.get("preferred_format"),
+        "saved_findings": memory.get("findings", {}),
+    }
+    return data, memory.get("last_updated")
+
+
+async def _past_analyses(service: Any, user_id: str) -> tuple[dict, Any]:
+    """Get past session summaries as (data, last_updated)."""
+    past_sessions = await service.get_past_analyses(user_id, limit=5)
+    data = {
+        "sessions": past_sessions,
+        "total_sessions": len(past_sessions),
+    }
+    return data, past_sessions[0].get("date") if past_sessions else None
+
+
 async def get_conversation_context(
-    context_type: Literal["current_session", "user_preferences", "past_analyses"],
+    context_type: Literal["current_session", "user_preferences", "past_analyses", "all"],
     user_id: str,
     session_id: str,
 ) -> dict[str, Any]:
@@ -57,7 +104,8 @@ async def get_conversation_context(
     Retrieve conversation context from Firestore.
 
     Args:
-        context_type: Type of context to retrieve
+        context_type: Type of context to retrieve ("all" fetches every type
+            concurrently and returns them keyed by type)
         user_id: The user's ID
         session_id: The current session ID
 
@@ -76,45 +124,29 @@ async def get_conversation_context(
 
     try:
         if context_type == "current_session":
-            # Get current session context
-            context_data = await service.get_session_context(user_id, session_id)
-            return {
-                "success": True,
-                "context_type": context_type,
-                "data": context_data,
-                "last_updated": context_data.get("last_updated"),
-            }
+            data, last_updated = await _current_session(service, user_id, session_id)
 
         elif context_type == "user_preferences":
-            # Get user preferences and findings from memory
-            memory = await service.get_user_memory(user_id)
-            preferences = memory.get("preferences", {})
-            findings = memory.get("findings", {})
-            return {
-                "success": True,
-                "context_type": context_type,
-                "data": {
-                    "preferences": preferences,
-                    "regions_of_interest": preferences.get("regions_of_interest", []),
-                    "role": preferences.get("role"),
-                    "preferred_format": preferences.get("preferred_format"),
-                    "saved_findings": findings,
-                },
-                "last_updated": memory.get("last_updated"),
-            }
+            data, last_updated = await _user_preferences(service, user_id)
 
         elif context_type == "past_analyses":
-            # Get past session summaries
-            past_sessions = await service.get_past_analyses(user_id, limit=5)
-            return {
-                "success": True,
-                "context_type": context_type,
-                "data": {
-                    "sessions": past_sessions,
-                    "total_sessions": len(past_sessions),
-                },
-                "last_updated": past_sessions[0].get("date") if past_sessions else None,
-            }
+            data, last_updated = await _past_analyses(service, user_id)
+
+        elif context_type == "all":
+            # Independent reads: latency is the slowest one, not the sum
+            parts = await asyncio.gather(
+                _current_session(service, user_id, session_id),
+                _user_preferences(service, user_id),
+                _past_analyses(service, user_id),
+            )
+            names = ("current_session", "user_preferences", "past_analyses")
+            data = {name: part_data for name, (part_data, _) in zip(names, parts)}
+            # Sources mix datetimes and ISO strings, so compare as datetimes
+            latest = max(
+                filter(None, (_as_datetime(updated) for _, updated in parts)),
+                default=None,
+            )
+            last_updated = latest.isoformat() if latest else None
 
         else:
             return {
@@ -125,6 +157,13 @@ async def get_conversation_context(
                 "last_updated": None,
             }
 
+        return {
+            "success": True,
+            "context_type": context_type,
+            "data": data,
+            "last_updated": last_updated,
+        }
+
     except Exception as e:
         return {
             "success": False,
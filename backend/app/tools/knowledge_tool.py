@@ -8,7 +8,7 @@ for metric definitions, targets, strategies, and policies.
 from typing import Any
 
 from app.services.rag_engine import get_rag_service
-from app.services.tool_middleware import log_tool_call, sanitize_tool_output
+from app.services.tool_middleware import log_tool_call, sanitize_tool_output, singleflight
 
 
 # Tool definition for ADK/Gemini function calling
@@ -47,7 +47,9 @@ Always cite the source document in your response.
             "top_k": {
                 "type": "integer",
                 "description": "Number of results to return (default: 3, max: 5)",
-                "default": 3
+                "default": 3,
+                "minimum": 1,
+                "maximum": 5
             }
         },
         "required": ["query"]
@@ -82,12 +84,16 @@ async def search_knowledge_base(
             session_id=session_id,
         )
 
-    # Clamp top_k
-    top_k = max(1, min(top_k, 5))
+    # Clamp top_k (the schema also bounds it, but the model may not comply)
+    top_k = 1 if top_k < 1 else 5 if top_k > 5 else top_k
 
-    # Get RAG service and search
-    service = get_rag_service()
-    result = await service.search(query=query, top_k=top_k)
+    async def run() -> dict[str, Any]:
+        # Get RAG service and search
+        service = get_rag_service()
+        result = await service.search(query=query, top_k=top_k)
 
-    # Sanitize output before returning
-    return sanitize_tool_output("search_knowledge_base", result)
+        # Sanitize output before returning
+        return sanitize_tool_output("search_knowledge_base", result)
+
+    # Identical searches already running share that request
+    return await singleflight(("search_knowledge_base", query, top_k), run)
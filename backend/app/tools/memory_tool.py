@@ -86,20 +86,11 @@ async def save_to_memory(
 
     service = get_firestore_service()
 
-    # Save to user memory
-    result = await service.save_memory(
+    # Save to user memory (findings are also recorded on the session context)
+    return await service.save_memory(
         user_id=user_id,
         memory_type=memory_type,
         key=key,
         value=value,
+        session_id=session_id,
     )
-
-    # Also update session context if it's a finding
-    if result.get("success") and memory_type == "finding":
-        await service.update_session_context(
-            user_id=user_id,
-            session_id=session_id,
-            finding=f"{key}: {value}",
-        )
-
-    return result
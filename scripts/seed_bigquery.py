@@ -11,16 +11,16 @@ Usage:
     python scripts/seed_bigquery.py
 """
 
+import csv
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
 
 from google.cloud import bigquery
 from google.cloud.exceptions import NotFound
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-
 # Configuration
 PROJECT_ID = os.getenv("GCP_PROJECT_ID", "insightagent-adk")
 DATASET_ID = os.getenv("BQ_DATASET_ID", "insightagent_data")
@@ -30,6 +30,59 @@ LOCATION = os.getenv("VERTEX_LOCATION", "asia-south1")
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data" / "seed_data"
 
+# Upper bounds so a stuck request or job fails the script instead of hanging it
+API_TIMEOUT_SECONDS = 60  # Per API request (transient errors are retried)
+JOB_TIMEOUT_SECONDS = 600  # Waiting for a load or query job to finish
+
+
+# Transactions table schema
+TRANSACTIONS_SCHEMA = [
+    bigquery.SchemaField("transaction_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("date", "DATE", mode="REQUIRED"),
+    bigquery.SchemaField("region", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("product_line", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("customer_segment", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("quantity", "INTEGER", mode="REQUIRED"),
+    bigquery.SchemaField("unit_price", "FLOAT", mode="REQUIRED"),
+    bigquery.SchemaField("revenue", "FLOAT", mode="REQUIRED"),
+    bigquery.SchemaField("customer_id", "STRING", mode="REQUIRED"),
+]
+
+# Customers table schema
+CUSTOMERS_SCHEMA = [
+    bigquery.SchemaField("customer_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("name", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("segment", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("region", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("acquisition_date", "DATE", mode="REQUIRED"),
+    bigquery.SchemaField("lifetime_value", "FLOAT", mode="REQUIRED"),
+    bigquery.SchemaField("status", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("churn_date", "DATE", mode="NULLABLE"),
+]
+
+# Targets table schema
+TARGETS_SCHEMA = [
+    bigquery.SchemaField("target_id", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("region", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("year", "INTEGER", mode="REQUIRED"),
+    bigquery.SchemaField("quarter", "STRING", mode="REQUIRED"),
+    bigquery.SchemaField("target_amount", "FLOAT", mode="REQUIRED"),
+    bigquery.SchemaField("product_line", "STRING", mode="REQUIRED"),
+]
+
+TABLE_SCHEMAS = {
+    "transactions": TRANSACTIONS_SCHEMA,
+    "customers": CUSTOMERS_SCHEMA,
+    "targets": TARGETS_SCHEMA,
+}
+
+# Local parsers for the non-string column types, mirroring BigQuery's CSV parsing
+_CSV_PARSERS = {
+    "INTEGER": int,
+    "FLOAT": float,
+    "DATE": date.fromisoformat,
+}
+
 
 def get_client() -> bigquery.Client:
     """Create BigQuery client."""
@@ -40,48 +93,9 @@ def create_tables(client: bigquery.Client) -> None:
     """Create BigQuery tables with appropriate schemas."""
     dataset_ref = f"{PROJECT_ID}.{DATASET_ID}"
 
-    # Transactions table schema
-    transactions_schema = [
-        bigquery.SchemaField("transaction_id", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("date", "DATE", mode="REQUIRED"),
-        bigquery.SchemaField("region", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("product_line", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("customer_segment", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("quantity", "INTEGER", mode="REQUIRED"),
-        bigquery.SchemaField("unit_price", "FLOAT", mode="REQUIRED"),
-        bigquery.SchemaField("revenue", "FLOAT", mode="REQUIRED"),
-        bigquery.SchemaField("customer_id", "STRING", mode="REQUIRED"),
-    ]
-
-    # Customers table schema
-    customers_schema = [
-        bigquery.SchemaField("customer_id", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("name", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("segment", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("region", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("acquisition_date", "DATE", mode="REQUIRED"),
-        bigquery.SchemaField("lifetime_value", "FLOAT", mode="REQUIRED"),
-        bigquery.SchemaField("status", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("churn_date", "DATE", mode="NULLABLE"),
-    ]
-
-    # Targets table schema
-    targets_schema = [
-        bigquery.SchemaField("target_id", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("region", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("year", "INTEGER", mode="REQUIRED"),
-        bigquery.SchemaField("quarter", "STRING", mode="REQUIRED"),
-        bigquery.SchemaField("target_amount", "FLOAT", mode="REQUIRED"),
-        bigquery.SchemaField("product_line", "STRING", mode="REQUIRED"),
-    ]
-
-    tables = [
-        ("transactions", transactions_schema),
-        ("customers", customers_schema),
-        ("targets", targets_schema),
-    ]
+    tables = list(TABLE_SCHEMAS.items())
 
-    for table_name, schema in tables:
+    def recreate_table(table_name: str, schema: list[bigquery.SchemaField]) -> None:
         table_id = f"{dataset_ref}.{table_name}"
 
         # Delete existing table if it exists
@@ -96,9 +110,58 @@ def create_tables(client: bigquery.Client) -> None:
         table = client.create_table(table)
         print(f"  Created table: {table_name}")
 
+    # Tables are independent, so their delete/create round trips overlap
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        futures = [executor.submit(recreate_table, name, schema) for name, schema in tables]
+        for future in futures:
+            future.result()  # Re-raise any failure
+
+
+def validate_csv(csv_path: Path, schema: list[bigquery.SchemaField]) -> None:
+    """
+    Check a CSV file against a table schema before uploading it.
+
+    Catches header mismatches, missing required values and unparseable
+    numbers or dates locally, instead of after a load job round trip.
+
+    Raises:
+        ValueError: Pointing at the first offending line and column
+    """
+    with open(csv_path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        expected = [field.name for field in schema]
+        if header != expected:
+            raise ValueError(f"{csv_path.name}: header {header} does not match schema {expected}")
+
+        for line_number, row in enumerate(reader, start=2):
+            if len(row) != len(schema):
+                raise ValueError(
+                    f"{csv_path.name}:{line_number}: expected {len(schema)} columns, got {len(row)}"
+                )
+            for field, value in zip(schema, row):
+                if not value:
+                    if field.mode == "REQUIRED":
+                        raise ValueError(f"{csv_path.name}:{line_number}: {field.name} is required")
+                    continue
+                parse = _CSV_PARSERS.get(field.field_type)
+                if parse is None:
+                    continue
+                try:
+                    parse(value)
+                except ValueError:
+                    raise ValueError(
+                        f"{csv_path.name}:{line_number}: {field.name}={value!r} is not a valid {field.field_type}"
+                    ) from None
+
+
+def load_csv_to_table(client: bigquery.Client, table_name: str, csv_path: Path) -> bigquery.LoadJob:
+    """
+    Start loading a CSV file into a BigQuery table.
 
-def load_csv_to_table(client: bigquery.Client, table_name: str, csv_path: Path) -> None:
-    """Load CSV file into BigQuery table."""
+    Returns the load job without waiting for it, so several loads can run
+    at once; call job.result() to wait.
+    """
     table_id = f"{PROJECT_ID}.{DATASET_ID}.{table_name}"
 
     job_config = bigquery.LoadJobConfig(
@@ -108,13 +171,9 @@ def load_csv_to_table(client: bigquery.Client, table_name: str, csv_path: Path)
     )
 
     with open(csv_path, "rb") as f:
-        job = client.load_table_from_file(f, table_id, job_config=job_config)
-
-    job.result()  # Wait for job to complete
-
-    # Get row count
-    table = client.get_table(table_id)
-    print(f"  Loaded {table.num_rows} rows into {table_name}")
+        return client.load_table_from_file(
+            f, table_id, job_config=job_config, timeout=API_TIMEOUT_SECONDS
+        )
 
 
 def verify_data(client: bigquery.Client) -> bool:
@@ -122,82 +181,81 @@ def verify_data(client: bigquery.Client) -> bool:
     print("\nVerifying data...")
 
     all_passed = True
+    transactions = f"`{PROJECT_ID}.{DATASET_ID}.transactions`"
+    targets = f"`{PROJECT_ID}.{DATASET_ID}.targets`"
+    customers = f"`{PROJECT_ID}.{DATASET_ID}.customers`"
 
-    # Test 1: Q4 2024 total revenue should be ~$12.4M
+    # All checks run in one query, so verification costs a single job round
+    # trip; the revenue sums share one conditional-aggregation scan of
+    # transactions instead of each scanning it separately
     query = f"""
-        SELECT SUM(revenue) as total_revenue
-        FROM `{PROJECT_ID}.{DATASET_ID}.transactions`
-        WHERE date >= '2024-10-01' AND date <= '2024-12-31'
+        WITH revenue AS (
+            SELECT
+                -- Test 1: Q4 2024 total revenue
+                SUM(IF(date BETWEEN '2024-10-01' AND '2024-12-31', revenue, 0)) AS q4_2024_revenue,
+                -- Test 3: West region Q4 2024 revenue
+                SUM(IF(region = 'West' AND date BETWEEN '2024-10-01' AND '2024-12-31', revenue, 0)) AS west_revenue,
+                -- Test 4: Q4 2023 total revenue
+                SUM(IF(date BETWEEN '2023-10-01' AND '2023-12-31', revenue, 0)) AS q4_2023_revenue
+            FROM {transactions}
+            WHERE date BETWEEN '2023-10-01' AND '2024-12-31'
+        )
+        SELECT
+            revenue.*,
+            -- Test 2: Q4 2024 target
+            (SELECT SUM(target_amount) FROM {targets}
+             WHERE year = 2024 AND quarter = 'Q4' AND product_line = 'All') AS q4_2024_target,
+            -- Test 3: West region Q4 2024 target
+            (SELECT target_amount FROM {targets}
+             WHERE region = 'West' AND year = 2024 AND quarter = 'Q4' AND product_line = 'All') AS west_target,
+            -- Test 5: Churned vs total customers
+            (SELECT COUNTIF(churn_date IS NOT NULL) FROM {customers}) AS churned,
+            (SELECT COUNT(*) FROM {customers}) AS total_customers
+        FROM revenue
     """
-    result = list(client.query(query).result())[0]
-    q4_revenue = result.total_revenue / 1_000_000
+    job = client.query(query, timeout=API_TIMEOUT_SECONDS)
+    result = next(iter(job.result(timeout=JOB_TIMEOUT_SECONDS)))
+
+    # Empty tables leave sums NULL and counts at zero; report that instead of
+    # failing on the arithmetic below
+    missing = [name for name, value in result.items() if value is None]
+    if not result.total_customers:
+        missing.append("customers")
+    if missing:
+        print(f"  ✗ No data for: {', '.join(missing)} - skipping value checks")
+        return False
+
+    # Test 1: Q4 2024 total revenue should be ~$12.4M
+    q4_revenue = result.q4_2024_revenue / 1_000_000
     expected = 12.4
     passed = abs(q4_revenue - expected) < 0.5  # Allow 500K variance
     print(f"  Q4 2024 Revenue: ${q4_revenue:.2f}M (expected ~${expected}M) {'✓' if passed else '✗'}")
     all_passed = all_passed and passed
 
     # Test 2: Q4 2024 target should be $13.0M
-    query = f"""
-        SELECT SUM(target_amount) as total_target
-        FROM `{PROJECT_ID}.{DATASET_ID}.targets`
-        WHERE year = 2024 AND quarter = 'Q4' AND product_line = 'All'
-    """
-    result = list(client.query(query).result())[0]
-    q4_target = result.total_target / 1_000_000
+    q4_target = result.q4_2024_target / 1_000_000
     expected = 13.0
     passed = abs(q4_target - expected) < 0.1
     print(f"  Q4 2024 Target: ${q4_target:.2f}M (expected ${expected}M) {'✓' if passed else '✗'}")
     all_passed = all_passed and passed
 
     # Test 3: West region Q4 2024 revenue vs target (should be ~-25.7%)
-    query = f"""
-        WITH west_revenue AS (
-            SELECT SUM(revenue) as revenue
-            FROM `{PROJECT_ID}.{DATASET_ID}.transactions`
-            WHERE region = 'West'
-            AND date >= '2024-10-01' AND date <= '2024-12-31'
-        ),
-        west_target AS (
-            SELECT target_amount
-            FROM `{PROJECT_ID}.{DATASET_ID}.targets`
-            WHERE region = 'West' AND year = 2024 AND quarter = 'Q4' AND product_line = 'All'
-        )
-        SELECT
-            r.revenue,
-            t.target_amount,
-            ((r.revenue - t.target_amount) / t.target_amount) * 100 as variance_pct
-        FROM west_revenue r, west_target t
-    """
-    result = list(client.query(query).result())[0]
-    variance = result.variance_pct
+    variance = ((result.west_revenue - result.west_target) / result.west_target) * 100
     expected = -25.7
     passed = abs(variance - expected) < 3  # Allow 3% variance
     print(f"  West Region Variance: {variance:.1f}% (expected ~{expected}%) {'✓' if passed else '✗'}")
     all_passed = all_passed and passed
 
     # Test 4: Q4 2023 revenue should be ~$9.6M
-    query = f"""
-        SELECT SUM(revenue) as total_revenue
-        FROM `{PROJECT_ID}.{DATASET_ID}.transactions`
-        WHERE date >= '2023-10-01' AND date <= '2023-12-31'
-    """
-    result = list(client.query(query).result())[0]
-    q4_2023_revenue = result.total_revenue / 1_000_000
+    q4_2023_revenue = result.q4_2023_revenue / 1_000_000
     expected = 9.6
     passed = abs(q4_2023_revenue - expected) < 0.5
     print(f"  Q4 2023 Revenue: ${q4_2023_revenue:.2f}M (expected ~${expected}M) {'✓' if passed else '✗'}")
     all_passed = all_passed and passed
 
     # Test 5: Churn rate check (customers with churn_date in recent period)
-    query = f"""
-        SELECT
-            COUNT(CASE WHEN churn_date IS NOT NULL THEN 1 END) as churned,
-            COUNT(*) as total
-        FROM `{PROJECT_ID}.{DATASET_ID}.customers`
-    """
-    result = list(client.query(query).result())[0]
-    churn_rate = (result.churned / result.total) * 100
-    print(f"  Overall Churn: {result.churned}/{result.total} customers ({churn_rate:.1f}%)")
+    churn_rate = (result.churned / result.total_customers) * 100
+    print(f"  Overall Churn: {result.churned}/{result.total_customers} customers ({churn_rate:.1f}%)")
 
     return all_passed
 
@@ -211,25 +269,43 @@ def main():
 
     client = get_client()
 
-    # Create tables
-    print("Creating tables...")
-    create_tables(client)
-    print()
-
-    # Load data
-    print("Loading data from CSV files...")
+    # Validate data
+    print("Validating CSV files...")
     csv_files = [
         ("transactions", DATA_DIR / "transactions.csv"),
         ("customers", DATA_DIR / "customers.csv"),
         ("targets", DATA_DIR / "targets.csv"),
     ]
 
+    # Checked locally first, so bad data fails before any table is replaced
+    present = []
     for table_name, csv_path in csv_files:
         if csv_path.exists():
-            load_csv_to_table(client, table_name, csv_path)
+            validate_csv(csv_path, TABLE_SCHEMAS[table_name])
+            present.append((table_name, csv_path))
         else:
             print(f"  Warning: {csv_path} not found, skipping")
 
+    print()
+
+    # Create tables
+    print("Creating tables...")
+    create_tables(client)
+    print()
+
+    # Load data
+    print("Loading data from CSV files...")
+    # Start every load first: the jobs run concurrently on the server, so
+    # waiting afterwards takes as long as the slowest one, not the sum
+    jobs = [
+        (table_name, load_csv_to_table(client, table_name, csv_path))
+        for table_name, csv_path in present
+    ]
+
+    for table_name, job in jobs:
+        job.result(timeout=JOB_TIMEOUT_SECONDS)  # Wait for job to complete
+        print(f"  Loaded {job.output_rows} rows into {table_name}")
+
     # Verify data
     if verify_data(client):
         print("\n✓ All verification checks passed!")
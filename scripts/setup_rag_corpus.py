@@ -11,10 +11,16 @@ Usage:
     python scripts/setup_rag_corpus.py
 """
 
+import hashlib
+import json
 import os
+import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 from google.cloud import storage
 from vertexai import rag
@@ -29,6 +35,16 @@ BUCKET_NAME = f"{PROJECT_ID}-rag-docs"
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 KNOWLEDGE_BASE_DIR = SCRIPT_DIR.parent / "knowledge_base"
+# Corpus name and per-file hashes from the last successful run, so re-runs
+# only upload and import documents that changed
+MANIFEST_PATH = SCRIPT_DIR.parent / "backend" / ".rag_manifest.json"
+ENV_PATH = SCRIPT_DIR.parent / "backend" / ".env"
+_CORPUS_NAME_LINE = re.compile(r"^RAG_CORPUS_NAME=(.*)$", re.MULTILINE)
+
+# Upper bounds so a stuck upload or import fails the script instead of hanging it
+UPLOAD_TIMEOUT_SECONDS = 60
+IMPORT_TIMEOUT_SECONDS = 600
+QUERY_TIMEOUT_SECONDS = 30
 
 
 def init_vertexai():
@@ -37,8 +53,55 @@ def init_vertexai():
     print(f"Initialized Vertex AI: project={PROJECT_ID}, location={LOCATION}")
 
 
-def upload_to_gcs(bucket_name: str, source_dir: Path) -> list[str]:
-    """Upload knowledge base files to GCS bucket."""
+def load_manifest() -> dict:
+    """Load the manifest from the last run (empty if missing or unreadable)."""
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(corpus: rag.RagCorpus, file_hashes: dict[str, str]) -> None:
+    """Record the corpus and the hashes of the documents it now holds."""
+    MANIFEST_PATH.write_text(json.dumps(
+        {"corpus_name": corpus.name, "files": file_hashes},
+        indent=2,
+        sort_keys=True,
+    ))
+
+
+def upload_to_gcs(
+    bucket_name: str,
+    source_dir: Path,
+    known_hashes: dict[str, str] | None = None,
+) -> tuple[list[str], dict[str, str]]:
+    """
+    Upload knowledge base files to GCS bucket.
+
+    Files whose MD5 matches known_hashes (from the manifest) are already in
+    the bucket and corpus, and are skipped.
+
+    Returns:
+        Tuple of (GCS paths of uploaded files, MD5 of every file by name)
+    """
+    known_hashes = known_hashes or {}
+    # One directory scan; DirEntry carries the file type, so no extra stats
+    with os.scandir(source_dir) as entries:
+        md_files = [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".md") and entry.is_file(follow_symlinks=False)
+        ]
+    file_hashes = {
+        file_path.name: hashlib.md5(file_path.read_bytes()).hexdigest()
+        for file_path in md_files
+    }
+    changed = [name for name, digest in file_hashes.items() if known_hashes.get(name) != digest]
+    for name in sorted(file_hashes.keys() - set(changed)):
+        print(f"  Unchanged: {name}")
+    if not changed:
+        return [], file_hashes
+
     storage_client = storage.Client(project=PROJECT_ID)
 
     # Create bucket if it doesn't exist
@@ -49,21 +112,35 @@ def upload_to_gcs(bucket_name: str, source_dir: Path) -> list[str]:
         bucket = storage_client.create_bucket(bucket_name, location=LOCATION)
         print(f"Created bucket: {bucket_name}")
 
-    # Upload files
-    gcs_paths = []
-    for file_path in source_dir.glob("*.md"):
-        blob_name = f"knowledge_base/{file_path.name}"
-        blob = bucket.blob(blob_name)
-        blob.upload_from_filename(str(file_path))
+    def upload(name: str) -> str:
+        blob_name = f"knowledge_base/{name}"
+        bucket.blob(blob_name).upload_from_filename(
+            str(source_dir / name), timeout=UPLOAD_TIMEOUT_SECONDS
+        )
         gcs_path = f"gs://{bucket_name}/{blob_name}"
-        gcs_paths.append(gcs_path)
-        print(f"  Uploaded: {file_path.name} -> {gcs_path}")
+        print(f"  Uploaded: {name} -> {gcs_path}")
+        return gcs_path
+
+    # Upload files concurrently; each upload is a latency-bound request
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        gcs_paths = list(executor.map(upload, changed))
+
+    return gcs_paths, file_hashes
 
-    return gcs_paths
 
+def get_existing_corpus(corpus_name: str | None = None) -> rag.RagCorpus | None:
+    """
+    Check if corpus already exists.
+
+    A known resource name (from the manifest or a saved RAG_CORPUS_NAME) is
+    looked up directly; listing all corpora is the fallback for first runs.
+    """
+    if corpus_name:
+        try:
+            return rag.get_corpus(name=corpus_name)
+        except Exception as e:
+            print(f"Corpus {corpus_name} not found ({e}), searching by display name")
 
-def get_existing_corpus() -> rag.RagCorpus | None:
-    """Check if corpus already exists."""
     try:
         corpora = list(rag.list_corpora())
         for corpus in corpora:
@@ -74,10 +151,10 @@ def get_existing_corpus() -> rag.RagCorpus | None:
     return None
 
 
-def create_corpus() -> rag.RagCorpus:
+def create_corpus(corpus_name: str | None = None) -> rag.RagCorpus:
     """Create a new RAG corpus."""
     # Check if corpus already exists
-    existing = get_existing_corpus()
+    existing = get_existing_corpus(corpus_name)
     if existing:
         print(f"Using existing corpus: {existing.name}")
         return existing
@@ -95,31 +172,30 @@ def import_documents(corpus: rag.RagCorpus, gcs_paths: list[str]) -> None:
     """Import documents into the RAG corpus."""
     print(f"\nImporting {len(gcs_paths)} documents into corpus...")
 
-    # Import files with chunking configuration
-    # Note: Using folder path instead of individual files
-    gcs_folder = f"gs://{BUCKET_NAME}/knowledge_base/"
-
+    # Import only the uploaded (new or changed) files, with chunking configuration
     response = rag.import_files(
         corpus_name=corpus.name,
-        paths=[gcs_folder],
+        paths=gcs_paths,
         transformation_config=rag.TransformationConfig(
             chunking_config=rag.ChunkingConfig(
                 chunk_size=512,  # 512 tokens per chunk
                 chunk_overlap=50  # 50 token overlap
             )
-        )
+        ),
+        timeout=IMPORT_TIMEOUT_SECONDS,
     )
 
     print(f"Import completed: {response}")
 
 
-def verify_corpus(corpus: rag.RagCorpus) -> bool:
+def verify_corpus(corpus: rag.RagCorpus, wait_for_indexing: bool = True) -> bool:
     """Verify the corpus is ready and can answer queries."""
     print("\nVerifying corpus...")
 
-    # Wait a bit for indexing
-    print("  Waiting for indexing to complete...")
-    time.sleep(5)
+    # Wait a bit for indexing (only needed right after an import)
+    if wait_for_indexing:
+        print("  Waiting for indexing to complete...")
+        time.sleep(5)
 
     # Test query
     test_queries = [
@@ -128,52 +204,83 @@ def verify_corpus(corpus: rag.RagCorpus) -> bool:
         "What is CompetitorX doing in the West region?",
     ]
 
-    all_passed = True
-    for query in test_queries:
-        try:
-            response = rag.retrieval_query(
-                rag_resources=[rag.RagResource(rag_corpus=corpus.name)],
-                text=query,
-                rag_retrieval_config=rag.RagRetrievalConfig(
-                    top_k=3,
-                    filter=rag.Filter(vector_distance_threshold=0.7)
-                )
+    def run_query(query: str):
+        return rag.retrieval_query(
+            rag_resources=[rag.RagResource(rag_corpus=corpus.name)],
+            text=query,
+            rag_retrieval_config=rag.RagRetrievalConfig(
+                top_k=3,
+                filter=rag.Filter(vector_distance_threshold=0.7)
             )
+        )
 
-            # Check if we got results
-            if response.contexts and response.contexts.contexts:
-                num_results = len(response.contexts.contexts)
-                print(f"  ✓ Query: '{query[:50]}...' -> {num_results} results")
-            else:
-                print(f"  ✗ Query: '{query[:50]}...' -> No results")
-                all_passed = False
+    # Queries are independent round trips, so they run concurrently. They use
+    # daemon threads because retrieval_query has no timeout of its own: a hung
+    # query is abandoned at the deadline and can't keep the script alive
+    outcomes: dict[str, Any] = {}
 
+    def worker(query: str) -> None:
+        try:
+            outcomes[query] = run_query(query)
         except Exception as e:
-            print(f"  ✗ Query failed: {e}")
+            outcomes[query] = e
+
+    threads = [threading.Thread(target=worker, args=(query,), daemon=True) for query in test_queries]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + QUERY_TIMEOUT_SECONDS
+
+    all_passed = True
+    for query, thread in zip(test_queries, threads):
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            print(f"  ✗ Query timed out after {QUERY_TIMEOUT_SECONDS}s: '{query[:50]}...'")
+            all_passed = False
+            continue
+
+        response = outcomes[query]
+        if isinstance(response, Exception):
+            print(f"  ✗ Query failed: {response}")
+            all_passed = False
+        # Check if we got results
+        elif response.contexts and response.contexts.contexts:
+            num_results = len(response.contexts.contexts)
+            print(f"  ✓ Query: '{query[:50]}...' -> {num_results} results")
+        else:
+            print(f"  ✗ Query: '{query[:50]}...' -> No results")
             all_passed = False
 
     return all_passed
 
 
+def load_corpus_name() -> str | None:
+    """Get the corpus name saved by a previous run (environment or .env file)."""
+    if os.getenv("RAG_CORPUS_NAME"):
+        return os.environ["RAG_CORPUS_NAME"]
+
+    if ENV_PATH.exists():
+        match = _CORPUS_NAME_LINE.search(ENV_PATH.read_text())
+        if match:
+            return match.group(1).strip() or None
+    return None
+
+
 def save_corpus_name(corpus: rag.RagCorpus) -> None:
     """Save the corpus name to .env file for later use."""
-    env_path = SCRIPT_DIR.parent / "backend" / ".env"
-
-    if env_path.exists():
-        content = env_path.read_text()
+    if ENV_PATH.exists():
+        content = ENV_PATH.read_text()
+        line = f"RAG_CORPUS_NAME={corpus.name}"
 
         # Update or add RAG_CORPUS_NAME
-        if "RAG_CORPUS_NAME=" in content:
-            lines = content.split("\n")
-            for i, line in enumerate(lines):
-                if line.startswith("RAG_CORPUS_NAME="):
-                    lines[i] = f"RAG_CORPUS_NAME={corpus.name}"
-                    break
-            content = "\n".join(lines)
-        else:
-            content += f"\nRAG_CORPUS_NAME={corpus.name}\n"
-
-        env_path.write_text(content)
+        content, replaced = _CORPUS_NAME_LINE.subn(lambda _: line, content, count=1)
+        if not replaced:
+            content = content.rstrip("\n") + f"\n{line}\n"
+
+        # Write a temporary file and swap it in, so an interrupted run
+        # can't leave a truncated .env behind
+        tmp_path = ENV_PATH.with_name(ENV_PATH.name + ".tmp")
+        tmp_path.write_text(content)
+        os.replace(tmp_path, ENV_PATH)
         print(f"\nUpdated .env with RAG_CORPUS_NAME={corpus.name}")
 
 
@@ -186,28 +293,37 @@ def main():
     init_vertexai()
     print()
 
-    # Upload documents to GCS
-    print("Uploading knowledge base to GCS...")
     if not KNOWLEDGE_BASE_DIR.exists():
         print(f"Error: Knowledge base directory not found: {KNOWLEDGE_BASE_DIR}")
         sys.exit(1)
 
-    gcs_paths = upload_to_gcs(BUCKET_NAME, KNOWLEDGE_BASE_DIR)
-    if not gcs_paths:
-        print("Error: No documents found to upload")
-        sys.exit(1)
-    print()
+    manifest = load_manifest()
 
     # Create corpus
     print("Creating RAG corpus...")
-    corpus = create_corpus()
+    corpus = create_corpus(manifest.get("corpus_name") or load_corpus_name())
+    print()
+
+    # Hashes only describe what is in this corpus; a new corpus needs every file
+    known_hashes = manifest.get("files") if manifest.get("corpus_name") == corpus.name else None
+
+    # Upload documents to GCS
+    print("Uploading knowledge base to GCS...")
+    gcs_paths, file_hashes = upload_to_gcs(BUCKET_NAME, KNOWLEDGE_BASE_DIR, known_hashes)
+    if not file_hashes:
+        print("Error: No documents found to upload")
+        sys.exit(1)
     print()
 
     # Import documents
-    import_documents(corpus, gcs_paths)
+    if gcs_paths:
+        import_documents(corpus, gcs_paths)
+        save_manifest(corpus, file_hashes)
+    else:
+        print("All documents unchanged since last import, skipping import")
 
     # Verify
-    if verify_corpus(corpus):
+    if verify_corpus(corpus, wait_for_indexing=bool(gcs_paths)):
         print("\n✓ RAG corpus setup complete!")
         save_corpus_name(corpus)
     else:
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import auth  # noqa: E402
+from app.api.auth import ApiKeyCorsMiddleware  # noqa: E402
+
+
+ORIGIN = "http://localhost:5173"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(auth, "_AUTH_DISABLED", False)
+    monkeypatch.setattr(auth, "_EXPECTED_KEY", b"secret")
+
+    app = FastAPI()
+    app.add_middleware(ApiKeyCorsMiddleware, allow_origins=[ORIGIN])
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/public")
+    async def public():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_rejects_missing_and_wrong_key(client):
+    assert client.get("/api/ping").status_code == 403
+    assert client.get("/api/ping", headers={"X-API-Key": "wrong"}).status_code == 403
+
+
+def test_accepts_valid_key_and_adds_cors_headers(client):
+    response = client.get("/api/ping", headers={"X-API-Key": "secret", "Origin": ORIGIN})
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+
+
+def test_non_api_paths_are_public(client):
+    assert client.get("/public").status_code == 200
+
+
+def test_health_answered_without_routing(client):
+    # The test app has no /health route, so this response comes from the middleware
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy", "service": "insightagent"}
+
+
+def test_preflight_answered_without_key(client):
+    response = client.options(
+        "/api/ping",
+        headers={"Origin": ORIGIN, "Access-Control-Request-Method": "GET"},
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+
+
+def test_preflight_rejects_unknown_origin(client):
+    response = client.options(
+        "/api/ping",
+        headers={"Origin": "http://evil.example", "Access-Control-Request-Method": "GET"},
+    )
+    assert response.status_code == 400
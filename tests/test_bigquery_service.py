@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from app.services.bigquery_service import BigQueryService  # noqa: E402
+from app.services.tool_middleware import sanitize_tool_output  # noqa: E402
+
+
+class FakeRowIterator:
+    """Stands in for bigquery.table.RowIterator: capped rows, full total."""
+
+    def __init__(self, rows, total_rows):
+        self._rows = rows
+        self.total_rows = total_rows
+        self.schema = [SimpleNamespace(name="n")]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+@pytest.fixture
+def service():
+    service = BigQueryService()
+    max_rows = service.settings.max_result_rows
+
+    job = MagicMock(total_bytes_processed=1024, total_bytes_billed=0)
+    job.result.side_effect = lambda timeout, max_results: FakeRowIterator(
+        [(i,) for i in range(max_results)], total_rows=max_rows * 5
+    )
+    service._client = MagicMock()
+    service._client.query.return_value = job
+    service.dry_run = AsyncMock(return_value={"valid": True, "bytes_processed": 1024})
+    return service
+
+
+def test_reports_true_total_when_rows_are_capped(service):
+    max_rows = service.settings.max_result_rows
+
+    result = asyncio.run(service.execute_query("SELECT n FROM t LIMIT 100000"))
+    assert len(result["rows"]) == max_rows
+    assert result["row_count"] == max_rows * 5
+
+    output = sanitize_tool_output("query_bigquery", result)
+    assert output["total_rows"] == max_rows * 5
+    assert output["truncated"] is True
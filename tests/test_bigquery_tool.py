@@ -0,0 +1,44 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from app.tools import bigquery_tool  # noqa: E402
+
+
+@pytest.fixture
+def service():
+    service = AsyncMock()
+    service.execute_query.return_value = {
+        "success": True,
+        "columns": ["region"],
+        "rows": [("West",)],
+        "row_count": 1,
+    }
+    bigquery_tool._query_cache.clear()
+    with patch.object(bigquery_tool, "get_bigquery_service", return_value=service):
+        yield service
+    bigquery_tool._query_cache.clear()
+
+
+def test_repeated_query_is_served_from_cache(service):
+    sql = "SELECT region FROM t"
+    first = asyncio.run(bigquery_tool.query_bigquery(sql))
+    second = asyncio.run(bigquery_tool.query_bigquery(sql + "\n"))
+    assert service.execute_query.await_count == 1
+    assert second == first
+    assert second["data"] == [{"region": "West"}]
+
+
+def test_volatile_query_is_not_cached(service):
+    sql = "SELECT region FROM t WHERE date = CURRENT_DATE()"
+    asyncio.run(bigquery_tool.query_bigquery(sql))
+    asyncio.run(bigquery_tool.query_bigquery(sql))
+    assert service.execute_query.await_count == 2
@@ -0,0 +1,28 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from app.tools import context_tool  # noqa: E402
+
+
+def test_all_context_picks_latest_across_datetimes_and_strings():
+    service = AsyncMock()
+    service.get_session_context.return_value = {"last_updated": "2024-01-01T12:00:00+00:00"}
+    service.get_cached_user_memory.return_value = {
+        # Later than the session update, but str() of it sorts before it
+        "last_updated": datetime(2024, 1, 1, 18, 0, tzinfo=timezone.utc),
+    }
+    service.get_past_analyses.return_value = [{"date": "2023-12-31T09:00:00+00:00"}]
+
+    with patch.object(context_tool, "get_firestore_service", return_value=service):
+        result = asyncio.run(context_tool.get_conversation_context("all", "user_1234", "session-1"))
+
+    assert result["success"] is True
+    assert result["last_updated"] == "2024-01-01T18:00:00+00:00"
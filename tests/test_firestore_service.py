@@ -0,0 +1,56 @@
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock
+
+import pytest
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from app.services import firestore_service  # noqa: E402
+from app.services.firestore_service import FirestoreService  # noqa: E402
+
+
+def _memory(user_id: str) -> dict:
+    return {
+        "summary": None,
+        "preferences": {"role": "analyst", "regions_of_interest": ["West"]},
+        "findings": {f"{user_id}_finding": {"content": "Revenue dropped"}},
+        "last_updated": None,
+    }
+
+
+@pytest.fixture
+def service():
+    service = FirestoreService()
+    service.get_user_memory = AsyncMock(side_effect=_memory)
+    return service
+
+
+def test_cached_memory_is_not_changed_by_callers(service):
+    async def run():
+        first = await service.get_cached_user_memory("alice")
+        first["preferences"]["role"] = "mutated by caller"
+        first["preferences"]["regions_of_interest"].append("East")
+        first["findings"].clear()
+        return await service.get_cached_user_memory("alice")
+
+    second = asyncio.run(run())
+    assert service.get_user_memory.await_count == 1
+    assert second == _memory("alice")
+
+
+def test_least_recently_used_user_is_evicted(service, monkeypatch):
+    monkeypatch.setattr(firestore_service, "USER_MEMORY_CACHE_MAX_ENTRIES", 2)
+
+    async def run():
+        await service.get_cached_user_memory("alice")
+        await service.get_cached_user_memory("bob")
+        await service.get_cached_user_memory("alice")  # alice is now most recent
+        await service.get_cached_user_memory("carol")
+
+    asyncio.run(run())
+    assert list(service._memory_cache) == ["alice", "carol"]
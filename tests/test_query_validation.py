@@ -0,0 +1,109 @@
+import os
+import sys
+
+import pytest
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from app.services.bigquery_service import BigQueryService  # noqa: E402
+
+
+@pytest.fixture
+def service():
+    return BigQueryService()
+
+
+def test_allows_plain_select(service):
+    assert service.validate_query("SELECT region, SUM(revenue) FROM t GROUP BY region") == (True, None)
+
+
+def test_allows_keyword_inside_identifier(service):
+    assert service.validate_query("SELECT updated_at, created_by FROM t") == (True, None)
+
+
+@pytest.mark.parametrize("sql,keyword", [
+    ("DELETE FROM t", "DELETE"),
+    ("select * from t where x in (select 1) union all select 1 from (drop table t)", "DROP"),
+    ("insert into t values (1)", "INSERT"),
+])
+def test_rejects_prohibited_keywords(service, sql, keyword):
+    is_valid, error = service.validate_query(sql)
+    assert is_valid is False
+    assert f"Prohibited keyword detected: {keyword}" in error
+
+
+def test_rejects_multiple_statements(service):
+    is_valid, error = service.validate_query("SELECT 1; SELECT 2")
+    assert is_valid is False
+    assert "semicolon" in error
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM t WHERE note = 'a;b'",
+    'SELECT "a;b" AS x',
+    "SELECT 'it\\'s; fine' AS x",
+    "SELECT 1 -- trailing; comment",
+    "SELECT 1 # trailing; comment",
+    "SELECT /* ; */ 1",
+    "SELECT r'\\d+;' AS pattern",
+    "SELECT b'a;b', RB'\\\\;', bR\"x;\"",
+    "SELECT '''multi\nline; text''' AS x",
+    'SELECT """a; \'b\'""" AS x',
+    "SELECT x FROM `my-project.insightagent_data.t;x`",
+])
+def test_allows_semicolons_in_literals_and_comments(service, sql):
+    assert service.validate_query(sql) == (True, None)
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT * FROM t WHERE note = 'please delete me'",
+    "SELECT 1 -- drop this later",
+    "SELECT 1 # drop this later",
+    "SELECT /* update */ 1",
+    "SELECT r'\\bDELETE\\b' AS pattern",
+    "SELECT b'truncate'",
+    "SELECT '''insert\ninto''' AS x",
+    'SELECT """merge""" AS x',
+    "SELECT x FROM `my-project.insightagent_data.update`",
+])
+def test_allows_keywords_in_literals_and_comments(service, sql):
+    assert service.validate_query(sql) == (True, None)
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT 1 /* note */ UNION ALL SELECT 1 FROM (DELETE FROM t)",
+    "SELECT 1 --c\nDELETE FROM t",
+    "SELECT 1 #c\nDELETE FROM t",
+    "SELECT 'a' DELETE FROM t",
+    "SELECT `t` ; SELECT 2",
+])
+def test_rejects_statements_outside_literals_and_comments(service, sql):
+    is_valid, _ = service.validate_query(sql)
+    assert is_valid is False
+
+
+@pytest.mark.parametrize("sql", [
+    # BigQuery '#' line comment hiding a quote
+    "SELECT 1 # '\n; DROP TABLE t -- '",
+    # Raw string whose backslash does not escape the closing quote
+    "SELECT r'\\' ; DELETE FROM t --'",
+])
+def test_rejects_statements_hidden_by_bigquery_lexing(service, sql):
+    is_valid, _ = service.validate_query(sql)
+    assert is_valid is False
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT 'unterminated",
+    "SELECT 1 /* unterminated",
+    "SELECT 'no\nnewlines'",
+    "SELECT '''unterminated'",
+    "SELECT `unterminated",
+])
+def test_rejects_unterminated_literals_and_comments(service, sql):
+    is_valid, error = service.validate_query(sql)
+    assert is_valid is False
+    assert "Unterminated" in error
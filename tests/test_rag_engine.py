@@ -0,0 +1,62 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from vertexai import rag  # noqa: E402
+
+from app.services.rag_engine import RAGEngineService  # noqa: E402
+
+
+@pytest.fixture
+def service():
+    service = RAGEngineService()
+    service._corpus_name = "projects/p/locations/l/ragCorpora/c"
+    service._rag = rag
+    service._initialized = True
+    return service
+
+
+@pytest.fixture
+def retrieval_calls(monkeypatch):
+    calls = []
+
+    def fake_retrieval_query(**kwargs):
+        calls.append(kwargs)
+        context = SimpleNamespace(
+            source_uri="gs://bucket/docs/policy.md", text="Refunds take 5 days", score=0.91
+        )
+        return SimpleNamespace(contexts=SimpleNamespace(contexts=[context]))
+
+    monkeypatch.setattr(rag, "retrieval_query", fake_retrieval_query)
+    return calls
+
+
+def test_formats_contexts(service, retrieval_calls):
+    result = asyncio.run(service.search("refund policy"))
+    assert result["success"] is True
+    assert result["results"] == [{
+        "content": "Refunds take 5 days",
+        "source": "policy.md",
+        "relevance_score": 0.91,
+        "source_uri": "gs://bucket/docs/policy.md",
+    }]
+
+
+def test_repeated_query_is_served_from_cache(service, retrieval_calls):
+    first = asyncio.run(service.search("Refund  policy"))
+    first["results"][0]["content"] = "mutated by caller"
+
+    second = asyncio.run(service.search("refund policy"))
+    assert len(retrieval_calls) == 1
+    assert second["results"][0]["content"] == "Refunds take 5 days"
+
+    asyncio.run(service.search("refund policy", top_k=5))
+    assert len(retrieval_calls) == 2
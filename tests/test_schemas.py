@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+from pydantic import ValidationError
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from app.models.schemas import MessageRequest, SessionCreate  # noqa: E402
+
+
+SESSION_ID = "0b6f7c1e-9a3d-4f2b-8c1d-2e3f4a5b6c7d"
+
+
+@pytest.mark.parametrize("user_id", ["demo_user", "user-42", "A" * 64])
+def test_accepts_valid_user_ids(user_id):
+    assert SessionCreate(user_id=user_id).user_id == user_id
+    assert MessageRequest(session_id=SESSION_ID, user_id=user_id, content="hi").user_id == user_id
+
+
+@pytest.mark.parametrize("user_id", ["", "a b", "user/1", "x" * 65, "user\n"])
+def test_rejects_invalid_user_ids(user_id):
+    with pytest.raises(ValidationError):
+        SessionCreate(user_id=user_id)
+    with pytest.raises(ValidationError):
+        MessageRequest(session_id=SESSION_ID, user_id=user_id, content="hi")
+
+
+def test_rejects_non_uuid4_session_id():
+    with pytest.raises(ValidationError):
+        MessageRequest(session_id="0b6f7c1e-9a3d-1f2b-8c1d-2e3f4a5b6c7d", user_id="u", content="hi")
+
+
+def test_normalizes_content_whitespace():
+    request = MessageRequest(session_id=SESSION_ID, user_id="u", content="  revenue\n\tby   region ")
+    assert request.content == "revenue by region"
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+
+# Add backend to path so `app.*` imports work in unit tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+
+from app.services.tool_middleware import (  # noqa: E402
+    redact_pii,
+    sanitize_kb_content,
+    sanitize_sql_results,
+    sanitize_tool_output,
+    singleflight,
+)
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("contact jane.doe@example.com today", "contact [EMAIL] today"),
+    ("ssn 123-45-6789", "ssn [SSN]"),
+    ("card 4111111111111111", "card [CARD]"),
+    ("card 4111-1111-1111-1111 on file", "card [CARD] on file"),
+    ("card 4111 1111 1111 1111", "card [CARD]"),
+    ("API_KEY=abc123 and more", "[REDACTED_SECRET] and more"),
+    ('password: "hunter2"', "[REDACTED_SECRET]"),
+    ("Token abc-def", "[REDACTED_SECRET]"),
+    ("a@b.com, 123-45-6789, secret=x", "[EMAIL], [SSN], [REDACTED_SECRET]"),
+])
+def test_redacts_pii(text, expected):
+    assert redact_pii(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "North America", "Q4 revenue grew 12%", "2024-10-01", "NA"])
+def test_leaves_clean_text_unchanged(text):
+    assert redact_pii(text) == text
+
+
+def test_sanitizes_sql_rows_into_dicts():
+    output = {
+        "success": True,
+        "columns": ["region", "contact", "revenue"],
+        "rows": [("West", "a@b.com", 10.5)] * 60,
+        "row_count": 60,
+    }
+    result = sanitize_tool_output("query_bigquery", output)
+    assert "rows" not in result
+    assert result["data"][0] == {"region": "West", "contact": "[EMAIL]", "revenue": 10.5}
+    assert result["total_rows"] == 60
+    assert result["displayed_rows"] == 50
+    assert result["truncated"] is True
+
+
+def test_sanitizes_sql_rows_from_iterator():
+    result = sanitize_sql_results(((i,) for i in range(60)), ["n"], max_rows=5)
+    assert result["data"] == [{"n": i} for i in range(5)]
+    assert result["total_rows"] == 60
+    assert result["displayed_rows"] == 5
+    assert result["truncated"] is True
+
+
+@pytest.mark.parametrize("row", [
+    ("password", "hunter2", "ok"),
+    ("card 4111", "1111 1111 1111", "x"),
+    ("a\x00b", "secret=x", None),
+])
+def test_sql_cells_are_redacted_independently(row):
+    result = sanitize_sql_results([row], ["a", "b", "c"])
+    assert list(result["data"][0].values()) == [
+        redact_pii(v) if isinstance(v, str) else v for v in row
+    ]
+
+
+def test_kb_content_is_truncated_and_cited():
+    result = sanitize_kb_content("word " * 1000, "policy.md")
+    assert len(result["content"]) <= 2003
+    assert result["content"].endswith("...")
+    assert result["citation"] == "Source: policy.md"
+    assert result["content"] == "word " * 399 + "word..."
+
+
+def test_kb_content_without_spaces_is_cut_at_limit():
+    result = sanitize_kb_content("x" * 3000, "policy.md")
+    assert result["content"] == "x" * 2000 + "..."
+
+
+def test_singleflight_runs_concurrent_calls_once():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"success": True}
+
+    async def main():
+        return await asyncio.gather(*(singleflight("k", call) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [{"success": True}] * 3
+
+
+def test_singleflight_propagates_errors_to_waiters():
+    async def call():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("backend down")
+
+    async def main():
+        return await asyncio.gather(
+            singleflight("k", call), singleflight("k", call), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]